@@ -7,9 +7,14 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
-from datetime import datetime, timedelta
-import time
+import plotly.io as pio
+from dataclasses import dataclass
+from datetime import datetime
+import hashlib
+import io
+from bisect import bisect_right
+from string import Template
+from utils.analysis import _DF_HASH_FUNCS, _compact_tasks, _hash_frame, lttb_indices
 
 # ==============================================================================
 # PAGE CONFIGURATION
@@ -24,7 +29,7 @@ st.set_page_config(
 # ==============================================================================
 # CUSTOM CSS STYLING
 # ==============================================================================
-st.markdown("""
+_GLOBAL_CSS = """
 <style>
     /* Main color palette */
     :root {
@@ -86,6 +91,11 @@ st.markdown("""
         margin: 1rem 0;
     }
     
+    /* Vertical gap before a dashboard section (stands in for <br> spacer calls) */
+    .section-gap {
+        height: 2.5rem;
+    }
+    
     .alert-danger {
         background-color: rgba(248, 113, 113, 0.1);
         border-left: 4px solid #F87171;
@@ -94,7 +104,14 @@ st.markdown("""
         margin: 1rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+def _inject_global_css():
+    """Emit the app-wide stylesheet; Streamlit rebuilds the page on every rerun,
+    so this must run each time (a once-per-session guard would drop the styles)"""
+    st.markdown(_GLOBAL_CSS, unsafe_allow_html=True)
+
+_inject_global_css()
 
 # ==============================================================================
 # SESSION STATE INITIALIZATION
@@ -110,44 +127,99 @@ if 'rhythm_score' not in st.session_state:
 if 'analysis_complete' not in st.session_state:
     st.session_state.analysis_complete = False
 
+def _go_to(page, **state):
+    """Button callback: switch page (and set any extra state) before the rerun starts,
+    so the click costs one script run instead of rendering the old page first"""
+    st.session_state.page = page
+    for key, value in state.items():
+        st.session_state[key] = value
+
 # ==============================================================================
 # HELPER FUNCTIONS FOR AI ANALYSIS
 # ==============================================================================
 
+# Column dtypes applied while parsing uploads (the pyarrow reader casts in-pass).
+# Score columns keep the reader's float64/int64: the insight medians and
+# threshold counts shift under float32 rounding. Task counts parse as float so
+# blank or fractional cells are accepted, then narrow via _compact_tasks
+_CSV_DTYPES = {
+    'work': {'tasks_completed': 'float64'},
+    'mood': {}
+}
+
+@st.cache_data(show_spinner=False)
+def _parse_csv(data, data_type):
+    """Parse uploaded CSV bytes; cached so reruns skip re-parsing the same file"""
+    df = pd.read_csv(
+        io.BytesIO(data), engine='pyarrow', parse_dates=['date'], dtype=_CSV_DTYPES[data_type]
+    )
+    # pyarrow leaves the column as text when any value fails to parse
+    if not pd.api.types.is_datetime64_any_dtype(df['date']):
+        raise ValueError("'date' column has values that are not valid dates (expected YYYY-MM-DD)")
+    if 'tasks_completed' in df:
+        df['tasks_completed'] = _compact_tasks(df['tasks_completed'])
+    return df
+
+# Columns each upload type must provide
+_REQUIRED_COLUMNS = {
+    'work': frozenset(['date', 'work_hours', 'tasks_completed']),
+    'mood': frozenset(['date', 'mood_score', 'stress_level', 'sleep_hours'])
+}
+
 def validate_csv_format(df, data_type):
     """Validate CSV format based on data type (work or mood)"""
-    required_columns = {
-        'work': ['date', 'work_hours', 'tasks_completed'],
-        'mood': ['date', 'mood_score', 'stress_level', 'sleep_hours']
-    }
-    
-    if data_type not in required_columns:
+    if data_type not in _REQUIRED_COLUMNS:
         return False, "Invalid data type"
     
-    missing_cols = set(required_columns[data_type]) - set(df.columns)
+    missing_cols = _REQUIRED_COLUMNS[data_type].difference(df.columns)
     if missing_cols:
         return False, f"Missing columns: {', '.join(missing_cols)}"
     
     return True, "Valid format"
 
-def calculate_rhythm_score(work_df, mood_df):
-    """
-    AI-powered calculation of Rhythm Score
-    Placeholder for actual ML model implementation
-    """
-    # Merge datasets on date
-    merged_df = pd.merge(work_df, mood_df, on='date', how='inner')
+# Numeric columns used by the score; order defines the corr_matrix axes
+_SCORE_COLUMNS = ['work_hours', 'tasks_completed', 'mood_score', 'stress_level', 'sleep_hours']
+_SCORE_COL_IDX = {col: i for i, col in enumerate(_SCORE_COLUMNS)}
+
+# Work-hour buckets used by the peak productivity insight
+_HOUR_BINS = [0, 7, 9, 24]
+_HOUR_LABELS = ['Low', 'Optimal', 'High']
+
+# Heatmap row order
+_DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Upper bound on points shipped to Plotly for per-day trend traces
+_DISPLAY_MAX_POINTS = 2000
+
+# Longer box-plot inputs are sent as quartile summaries instead of raw points
+_BOX_RAW_MAX_POINTS = 500
+
+@dataclass(frozen=True)
+class RhythmArrays:
+    """Score columns of the merged frame as contiguous float64 arrays, extracted once per analysis"""
+    work_hours: np.ndarray
+    tasks: np.ndarray
+    mood: np.ndarray
+    stress: np.ndarray
+    sleep: np.ndarray
+    
+    @classmethod
+    def from_frame(cls, df):
+        return cls(*(df[col].to_numpy(dtype=np.float64, na_value=np.nan) for col in _SCORE_COLUMNS))
+
+def _rhythm_kernel(work_hours, tasks, mood, stress, sleep):
+    """Score arithmetic on raw float arrays: column means, component scores, penalty"""
+    # Accumulate in float64 whatever the input dtype; NaNs are skipped like Series.mean()
+    avg_work_hours = np.nanmean(work_hours, dtype=np.float64)
+    avg_tasks = np.nanmean(tasks, dtype=np.float64)
+    avg_mood = np.nanmean(mood, dtype=np.float64)
+    avg_stress = np.nanmean(stress, dtype=np.float64)
+    avg_sleep = np.nanmean(sleep, dtype=np.float64)
     
-    # Calculate component scores (0-100 scale)
     # Machine productivity score
-    avg_work_hours = merged_df['work_hours'].mean()
-    avg_tasks = merged_df['tasks_completed'].mean()
     machine_score = min(100, (avg_work_hours / 8 * 50 + avg_tasks / 10 * 50))
     
     # Human wellbeing score
-    avg_mood = merged_df['mood_score'].mean()
-    avg_stress = merged_df['stress_level'].mean()
-    avg_sleep = merged_df['sleep_hours'].mean()
     human_score = (avg_mood / 10 * 40 + (10 - avg_stress) / 10 * 30 + avg_sleep / 8 * 30)
     
     # Balance penalty - penalize extreme imbalances
@@ -157,6 +229,43 @@ def calculate_rhythm_score(work_df, mood_df):
     # Final rhythm score
     rhythm_score = (machine_score + human_score) / 2 - balance_penalty
     
+    return (rhythm_score, machine_score, human_score,
+            avg_work_hours, avg_mood, avg_stress, avg_sleep)
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
+def calculate_rhythm_score(work_df, mood_df):
+    """
+    AI-powered calculation of Rhythm Score
+    Placeholder for actual ML model implementation
+    Returns None when the two datasets share no dates
+    """
+    # Align datasets on their sorted date index (set at upload time); score columns
+    # keep the caller's precision, only task counts are narrowed when lossless.
+    # Extra columns present in both uploads get pd.merge's _x/_y suffixes
+    merged_df = work_df.join(mood_df, how='inner', lsuffix='_x', rsuffix='_y').reset_index()
+    merged_df['tasks_completed'] = _compact_tasks(merged_df['tasks_completed'])
+    if merged_df.empty:
+        # No overlapping dates: nothing to score, let the caller report it
+        return None
+    
+    # Calendar keys for the heatmap and weekly scores, set before data_key is hashed;
+    # the ordered Categorical keeps weekday groups Monday-first without a reindex
+    merged_df['day_of_week'] = pd.Categorical(
+        merged_df['date'].dt.day_name(), categories=_DAY_ORDER, ordered=True
+    )
+    merged_df['week'] = merged_df['date'].dt.isocalendar().week
+    ra = RhythmArrays.from_frame(merged_df)
+    
+    # Calculate component scores (0-100 scale) on plain float arrays
+    (rhythm_score, machine_score, human_score,
+     avg_work_hours, avg_mood, avg_stress, avg_sleep) = _rhythm_kernel(
+        ra.work_hours, ra.tasks, ra.mood, ra.stress, ra.sleep
+    )
+    
+    # All pairwise Pearson correlations in one pass
+    corr_matrix = merged_df[_SCORE_COLUMNS].corr().to_numpy()
+    correlation = corr_matrix[_SCORE_COL_IDX['work_hours'], _SCORE_COL_IDX['mood_score']]
+    
     return {
         'rhythm_score': round(rhythm_score, 1),
         'machine_score': round(machine_score, 1),
@@ -165,61 +274,80 @@ def calculate_rhythm_score(work_df, mood_df):
         'avg_mood': round(avg_mood, 1),
         'avg_stress': round(avg_stress, 1),
         'avg_sleep': round(avg_sleep, 1),
-        'correlation': round(merged_df['work_hours'].corr(merged_df['mood_score']), 2),
-        'merged_data': merged_df
+        'correlation': round(correlation, 2),
+        'corr_matrix': corr_matrix,
+        'data_key': hashlib.sha1(_hash_frame(merged_df)).hexdigest(),
+        'merged_data': merged_df,
+        # Plain array tuple: the cached return is pickled, and the script-level
+        # RhythmArrays class cannot be
+        'arrays': tuple(vars(ra).values()),
+        'merged_data_display': merged_df.iloc[lttb_indices(
+            merged_df['date'].to_numpy().astype(np.int64).astype(np.float64),
+            ra.work_hours,
+            _DISPLAY_MAX_POINTS
+        )]
     }
 
-def detect_anomalies(merged_df):
+def _anomaly_kernel(work_hours, mood, sleep):
+    """Anomaly scan on raw float arrays: burnout and sleep-deficit day counts,
+    first/last-week mood means, longest run of 9+ hour days"""
+    burnout_days = int(np.count_nonzero((work_hours > 10) & (mood < 5)))
+    sleep_deficit = int(np.count_nonzero(sleep < 6))
+    
+    if mood.size > 7:
+        recent_mood = float(np.nanmean(mood[-7:], dtype=np.float64))
+        earlier_mood = float(np.nanmean(mood[:7], dtype=np.float64))
+    else:
+        recent_mood = earlier_mood = np.nan
+    
+    # Longest overwork streak from the run-length edges of the 9+ hour mask
+    overworked = (work_hours > 9).astype(np.int8)
+    edges = np.flatnonzero(np.diff(np.r_[0, overworked, 0]))
+    max_consecutive = int((edges[1::2] - edges[::2]).max(initial=0))
+    
+    return burnout_days, sleep_deficit, recent_mood, earlier_mood, max_consecutive
+
+@st.cache_data(show_spinner=False)
+def detect_anomalies(data_key, _ra):
     """
     AI-powered anomaly detection
     Placeholder for actual ML anomaly detection
+    Cached on data_key; returns a tuple of alert dicts
     """
     anomalies = []
     
+    burnout_days, sleep_deficit, recent_mood, earlier_mood, max_consecutive = _anomaly_kernel(
+        _ra.work_hours, _ra.mood, _ra.sleep
+    )
+    
     # Detect burnout risk (high work + low mood)
-    burnout_days = merged_df[
-        (merged_df['work_hours'] > 10) & (merged_df['mood_score'] < 5)
-    ]
-    if len(burnout_days) > 0:
+    if burnout_days > 0:
         anomalies.append({
             'type': 'danger',
             'title': 'Burnout Risk Detected',
-            'description': f'{len(burnout_days)} days with 10+ work hours and mood below 5',
+            'description': f'{burnout_days} days with 10+ work hours and mood below 5',
             'icon': '🚨'
         })
     
     # Detect sleep deficit
-    sleep_deficit = merged_df[merged_df['sleep_hours'] < 6]
-    if len(sleep_deficit) > 3:
+    if sleep_deficit > 3:
         anomalies.append({
             'type': 'warning',
             'title': 'Sleep Deficit Pattern',
-            'description': f'{len(sleep_deficit)} days with less than 6 hours of sleep',
+            'description': f'{sleep_deficit} days with less than 6 hours of sleep',
             'icon': '😴'
         })
     
-    # Detect positive trends
-    if len(merged_df) > 7:
-        recent_mood = merged_df.tail(7)['mood_score'].mean()
-        earlier_mood = merged_df.head(7)['mood_score'].mean()
-        if recent_mood > earlier_mood + 1:
-            anomalies.append({
-                'type': 'success',
-                'title': 'Positive Mood Trend',
-                'description': f'Mood improved by {round(recent_mood - earlier_mood, 1)} points in recent week',
-                'icon': '✨'
-            })
+    # Detect positive trends (NaN means fewer than 8 days, so no comparison)
+    if recent_mood > earlier_mood + 1:
+        anomalies.append({
+            'type': 'success',
+            'title': 'Positive Mood Trend',
+            'description': f'Mood improved by {round(recent_mood - earlier_mood, 1)} points in recent week',
+            'icon': '✨'
+        })
     
     # Detect overwork periods
-    consecutive_overwork = 0
-    max_consecutive = 0
-    for hours in merged_df['work_hours']:
-        if hours > 9:
-            consecutive_overwork += 1
-            max_consecutive = max(max_consecutive, consecutive_overwork)
-        else:
-            consecutive_overwork = 0
-    
     if max_consecutive >= 3:
         anomalies.append({
             'type': 'warning',
@@ -228,29 +356,33 @@ def detect_anomalies(merged_df):
             'icon': '⚠️'
         })
     
-    return anomalies
+    return tuple(anomalies)
 
-def generate_insights(analysis_results):
+@st.cache_data(show_spinner=False)
+def generate_insights(data_key, correlation, sleep_mood_corr, _ra):
     """
     AI-generated personalized insights
     Placeholder for actual NLP/LLM integration
+    Cached on the scalar arguments; returns a tuple of insight dicts
     """
     insights = []
     
-    merged_df = analysis_results['merged_data']
-    correlation = analysis_results['correlation']
-    
     # Insight 1: Peak productivity pattern
-    merged_df['hour_category'] = pd.cut(merged_df['work_hours'], 
-                                         bins=[0, 7, 9, 24], 
-                                         labels=['Low', 'Optimal', 'High'])
-    mood_by_hours = merged_df.groupby('hour_category')['mood_score'].mean()
-    
-    best_category = mood_by_hours.idxmax()
+    # Bucket work hours into (0, 7], (7, 9], (9, 24]; codes 0 and 4 fall outside
+    work_hours, mood = _ra.work_hours, _ra.mood
+    has_mood = ~np.isnan(mood)
+    codes = np.digitize(work_hours[has_mood], _HOUR_BINS, right=True)
+    # groupby mean rather than bincount sums: same summation as the baseline, so
+    # the rounded averages in the text do not drift
+    mood_by_hours = (pd.Series(mood[has_mood]).groupby(codes).mean()
+                     .reindex([1, 2, 3]).to_numpy())
+    
+    best = int(np.nanargmax(mood_by_hours))
+    best_category = _HOUR_LABELS[best]
     insights.append({
         'icon': '📈',
         'title': 'Peak Productivity Pattern',
-        'description': f'Your mood is highest during {best_category} work hour days (avg mood: {mood_by_hours.max():.1f})',
+        'description': f'Your mood is highest during {best_category} work hour days (avg mood: {mood_by_hours[best]:.1f})',
         'recommendation': 'Structure your week to maintain optimal work duration. Quality over quantity leads to better outcomes.',
         'color': 'machine'
     })
@@ -274,127 +406,207 @@ def generate_insights(analysis_results):
         })
     
     # Insight 3: Sleep impact
-    sleep_mood_corr = merged_df['sleep_hours'].corr(merged_df['mood_score'])
     if sleep_mood_corr > 0.4:
         insights.append({
             'icon': '😴',
             'title': 'Sleep is Your Superpower',
             'description': f'Strong link between sleep and mood (correlation: {sleep_mood_corr:.2f})',
-            'recommendation': f'Prioritize {merged_df["sleep_hours"].quantile(0.75):.1f}+ hours of sleep. Your data shows this directly improves your wellbeing.',
+            'recommendation': f'Prioritize {np.nanquantile(_ra.sleep, 0.75):.1f}+ hours of sleep. Your data shows this directly improves your wellbeing.',
             'color': 'human'
         })
     
     # Insight 4: Optimal work range
-    optimal_work = merged_df[merged_df['mood_score'] >= 7]['work_hours'].median()
+    high_mood_hours = work_hours[mood >= 7]
+    optimal_work = float(np.nanmedian(high_mood_hours)) if high_mood_hours.size else np.nan
+    adherence_pct = float(np.mean(np.abs(work_hours - optimal_work) < 1)) * 100
     insights.append({
         'icon': '🎯',
         'title': 'Your Sweet Spot Identified',
         'description': f'You maintain high mood (7+) with around {optimal_work:.1f} work hours per day',
-        'recommendation': f'Target {optimal_work:.1f} hours as your baseline. Current adherence: {len(merged_df[abs(merged_df["work_hours"] - optimal_work) < 1]) / len(merged_df) * 100:.0f}% of days.',
+        'recommendation': f'Target {optimal_work:.1f} hours as your baseline. Current adherence: {adherence_pct:.0f}% of days.',
         'color': 'balance'
     })
     
-    return insights
+    return tuple(insights)
+
+# Dashboard/insights aggregations below are keyed by the dataset's content hash
+# (data_key); the underscore-prefixed frame is not hashed again on each rerun
+
+@st.cache_data(show_spinner=False)
+def _heatmap_pivot(data_key, _merged_df):
+    """Mean work hours per weekday (rows, Monday first) and ISO week (columns)"""
+    # observed=True drops weekdays absent from the data
+    return (
+        _merged_df.groupby(['day_of_week', 'week'], observed=True)['work_hours']
+        .mean()
+        .unstack('week')
+    )
+
+@st.cache_data(show_spinner=False)
+def _weekly_scores(data_key, _merged_df):
+    """Per-ISO-week rhythm, machine and human scores, in order of first appearance"""
+    g = _merged_df.groupby('week', sort=False).agg(
+        wh=('work_hours', 'mean'),
+        tc=('tasks_completed', 'mean'),
+        ms=('mood_score', 'mean'),
+        sl=('stress_level', 'mean'),
+        sh=('sleep_hours', 'mean')
+    )
+    
+    g['machine'] = g['wh'] / 8 * 50 + g['tc'] / 10 * 50
+    g['human'] = g['ms'] / 10 * 40 + (10 - g['sl']) / 10 * 30 + g['sh'] / 8 * 30
+    g['score'] = (g['machine'] + g['human']) / 2
+    
+    weekly_df = g[['score', 'machine', 'human']].round(1).reset_index()
+    weekly_df['week'] = 'Week ' + weekly_df['week'].astype(str)
+    return weekly_df
+
+@st.cache_data(show_spinner=False)
+def _report_csv_bytes(data_key, _merged_df, rhythm_score, machine_score, human_score):
+    """Merged data plus the overall scores as UTF-8 CSV bytes for the report download"""
+    return _merged_df.assign(
+        rhythm_score=rhythm_score,
+        machine_score=machine_score,
+        human_score=human_score
+    ).to_csv(index=False).encode('utf-8')
+
+@st.cache_data(show_spinner=False)
+def _make_sample(seed=0, n=30):
+    """Seeded sample work/mood data, indexed by date like uploaded CSVs"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start='2025-01-01', periods=n, freq='D', name='date')
+    
+    # Sample work data
+    work_hours = rng.normal(8, 1.5, n).clip(5, 12)
+    work_data = pd.DataFrame({
+        'work_hours': work_hours,
+        'tasks_completed': rng.poisson(10, n),
+        'server_uptime': rng.uniform(98, 100, n)
+    }, index=dates)
+    work_data['tasks_completed'] = _compact_tasks(work_data['tasks_completed'])
+    
+    # Sample mood data (inversely correlated with work hours)
+    mood_data = pd.DataFrame({
+        'mood_score': (10 - work_hours * 0.5 + rng.normal(0, 1, n)).clip(1, 10),
+        'stress_level': (work_hours * 0.5 + rng.normal(0, 1, n)).clip(1, 10),
+        'sleep_hours': (9 - work_hours * 0.2 + rng.normal(0, 0.5, n)).clip(5, 9)
+    }, index=dates)
+    
+    return work_data, mood_data
 
 # ==============================================================================
 # PAGE 1: HOME PAGE
 # ==============================================================================
 
+# Static page HTML, built once per process rather than on every rerun
+_HOME_HEADER_HTML = """
+    <div style='text-align: center; padding: 3rem 0;'>
+        <h1 style='font-size: 4rem; background: linear-gradient(135deg, #00D9FF 0%, #B794F6 50%, #FF6B9D 100%); 
+                   -webkit-background-clip: text; -webkit-text-fill-color: transparent; margin-bottom: 1rem;'>
+            🤖❤️ Rhythm of the Machines
+        </h1>
+        <h2 style='color: #B794F6; font-size: 2rem; margin-bottom: 2rem;'>
+            Balance between Human & Machine Productivity
+        </h2>
+    </div>
+"""
+
+_HOME_INTRO_HTML = """
+    <div style='text-align: center; font-size: 1.2rem; color: #94a3b8; line-height: 1.8;'>
+        <p>Harmonize your work metrics with wellbeing indicators. Our AI analyzes the 
+        delicate balance between productivity and health, helping you find sustainable 
+        rhythm in the modern workplace.</p>
+    </div>
+"""
+
+_FEATURE_CARDS_HTML = (
+    """
+    <div style='text-align: center; padding: 1.5rem; background: rgba(0, 217, 255, 0.1); 
+                border-radius: 15px; margin: 1rem 0;'>
+        <div style='font-size: 3rem;'>🧠</div>
+        <div style='font-weight: bold; color: #00D9FF; margin-top: 0.5rem;'>AI-Powered</div>
+        <div style='color: #94a3b8; font-size: 0.9rem;'>Smart Analysis</div>
+    </div>
+    """,
+    """
+    <div style='text-align: center; padding: 1.5rem; background: rgba(183, 148, 246, 0.1); 
+                border-radius: 15px; margin: 1rem 0;'>
+        <div style='font-size: 3rem;'>📊</div>
+        <div style='font-weight: bold; color: #B794F6; margin-top: 0.5rem;'>Real-time Score</div>
+        <div style='color: #94a3b8; font-size: 0.9rem;'>Live Monitoring</div>
+    </div>
+    """,
+    """
+    <div style='text-align: center; padding: 1.5rem; background: rgba(255, 107, 157, 0.1); 
+                border-radius: 15px; margin: 1rem 0;'>
+        <div style='font-size: 3rem;'>💡</div>
+        <div style='font-weight: bold; color: #FF6B9D; margin-top: 0.5rem;'>Smart Insights</div>
+        <div style='color: #94a3b8; font-size: 0.9rem;'>Actionable Tips</div>
+    </div>
+    """
+)
+
 def home_page():
     """Landing page with animated introduction"""
     
     # Animated header with emojis
-    st.markdown("""
-        <div style='text-align: center; padding: 3rem 0;'>
-            <h1 style='font-size: 4rem; background: linear-gradient(135deg, #00D9FF 0%, #B794F6 50%, #FF6B9D 100%); 
-                       -webkit-background-clip: text; -webkit-text-fill-color: transparent; margin-bottom: 1rem;'>
-                🤖❤️ Rhythm of the Machines
-            </h1>
-            <h2 style='color: #B794F6; font-size: 2rem; margin-bottom: 2rem;'>
-                Balance between Human & Machine Productivity
-            </h2>
-        </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_HOME_HEADER_HTML, unsafe_allow_html=True)
     
     # Animated description with rotating emojis
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
-        st.markdown("""
-            <div style='text-align: center; font-size: 1.2rem; color: #94a3b8; line-height: 1.8;'>
-                <p>Harmonize your work metrics with wellbeing indicators. Our AI analyzes the 
-                delicate balance between productivity and health, helping you find sustainable 
-                rhythm in the modern workplace.</p>
-            </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_HOME_INTRO_HTML, unsafe_allow_html=True)
         
         st.markdown("<br>", unsafe_allow_html=True)
         
         # Feature highlights in columns
-        feat1, feat2, feat3 = st.columns(3)
-        with feat1:
-            st.markdown("""
-                <div style='text-align: center; padding: 1.5rem; background: rgba(0, 217, 255, 0.1); 
-                            border-radius: 15px; margin: 1rem 0;'>
-                    <div style='font-size: 3rem;'>🧠</div>
-                    <div style='font-weight: bold; color: #00D9FF; margin-top: 0.5rem;'>AI-Powered</div>
-                    <div style='color: #94a3b8; font-size: 0.9rem;'>Smart Analysis</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with feat2:
-            st.markdown("""
-                <div style='text-align: center; padding: 1.5rem; background: rgba(183, 148, 246, 0.1); 
-                            border-radius: 15px; margin: 1rem 0;'>
-                    <div style='font-size: 3rem;'>📊</div>
-                    <div style='font-weight: bold; color: #B794F6; margin-top: 0.5rem;'>Real-time Score</div>
-                    <div style='color: #94a3b8; font-size: 0.9rem;'>Live Monitoring</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with feat3:
-            st.markdown("""
-                <div style='text-align: center; padding: 1.5rem; background: rgba(255, 107, 157, 0.1); 
-                            border-radius: 15px; margin: 1rem 0;'>
-                    <div style='font-size: 3rem;'>💡</div>
-                    <div style='font-weight: bold; color: #FF6B9D; margin-top: 0.5rem;'>Smart Insights</div>
-                    <div style='color: #94a3b8; font-size: 0.9rem;'>Actionable Tips</div>
-                </div>
-            """, unsafe_allow_html=True)
+        for feat_col, card_html in zip(st.columns(3), _FEATURE_CARDS_HTML):
+            feat_col.markdown(card_html, unsafe_allow_html=True)
         
         st.markdown("<br>", unsafe_allow_html=True)
         
         # Get Started button
-        if st.button("🚀 Get Started", key="get_started"):
-            st.session_state.page = 'upload'
-            st.rerun()
+        st.button("🚀 Get Started", key="get_started", on_click=_go_to, args=('upload',))
 
 # ==============================================================================
 # PAGE 2: DATA UPLOAD PAGE
 # ==============================================================================
 
+_UPLOAD_HEADER_HTML = """
+    <h1 style='background: linear-gradient(135deg, #00D9FF 0%, #FF6B9D 100%); 
+               -webkit-background-clip: text; -webkit-text-fill-color: transparent;'>
+        📤 Upload Your Data
+    </h1>
+    <p style='font-size: 1.2rem; color: #94a3b8; margin-bottom: 2rem;'>
+        Feed the rhythm with your productivity and wellbeing metrics
+    </p>
+"""
+
+_UPLOAD_PANEL_HTML = {
+    'work': """
+        <div style='padding: 1.5rem; background: rgba(0, 217, 255, 0.05); 
+                    border: 2px solid #00D9FF; border-radius: 20px; margin-bottom: 2rem;'>
+            <h3 style='color: #00D9FF;'>🤖 Machine Productivity</h3>
+        </div>
+    """,
+    'mood': """
+        <div style='padding: 1.5rem; background: rgba(255, 107, 157, 0.05); 
+                    border: 2px solid #FF6B9D; border-radius: 20px; margin-bottom: 2rem;'>
+            <h3 style='color: #FF6B9D;'>❤️ Human Wellbeing</h3>
+        </div>
+    """
+}
+
 def upload_page():
     """Data upload page with clear instructions"""
     
-    st.markdown("""
-        <h1 style='background: linear-gradient(135deg, #00D9FF 0%, #FF6B9D 100%); 
-                   -webkit-background-clip: text; -webkit-text-fill-color: transparent;'>
-            📤 Upload Your Data
-        </h1>
-        <p style='font-size: 1.2rem; color: #94a3b8; margin-bottom: 2rem;'>
-            Feed the rhythm with your productivity and wellbeing metrics
-        </p>
-    """, unsafe_allow_html=True)
+    st.markdown(_UPLOAD_HEADER_HTML, unsafe_allow_html=True)
     
     col1, col2 = st.columns(2)
     
     # Machine Productivity Upload
     with col1:
-        st.markdown("""
-            <div style='padding: 1.5rem; background: rgba(0, 217, 255, 0.05); 
-                        border: 2px solid #00D9FF; border-radius: 20px; margin-bottom: 2rem;'>
-                <h3 style='color: #00D9FF;'>🤖 Machine Productivity</h3>
-            </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_UPLOAD_PANEL_HTML['work'], unsafe_allow_html=True)
         
         work_file = st.file_uploader(
             "Upload work data CSV",
@@ -415,11 +627,11 @@ date,work_hours,tasks_completed,server_uptime
         
         if work_file:
             try:
-                work_df = pd.read_csv(work_file)
-                work_df['date'] = pd.to_datetime(work_df['date'])
+                work_df = _parse_csv(work_file.getvalue(), 'work')
                 
                 is_valid, message = validate_csv_format(work_df, 'work')
                 if is_valid:
+                    work_df = work_df.set_index('date').sort_index()
                     st.session_state.work_data = work_df
                     st.success(f"✅ Loaded {len(work_df)} days of work data")
                     st.dataframe(work_df.head(), use_container_width=True)
@@ -430,12 +642,7 @@ date,work_hours,tasks_completed,server_uptime
     
     # Human Wellbeing Upload
     with col2:
-        st.markdown("""
-            <div style='padding: 1.5rem; background: rgba(255, 107, 157, 0.05); 
-                        border: 2px solid #FF6B9D; border-radius: 20px; margin-bottom: 2rem;'>
-                <h3 style='color: #FF6B9D;'>❤️ Human Wellbeing</h3>
-            </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_UPLOAD_PANEL_HTML['mood'], unsafe_allow_html=True)
         
         mood_file = st.file_uploader(
             "Upload wellbeing data CSV",
@@ -456,11 +663,11 @@ date,mood_score,stress_level,sleep_hours
         
         if mood_file:
             try:
-                mood_df = pd.read_csv(mood_file)
-                mood_df['date'] = pd.to_datetime(mood_df['date'])
+                mood_df = _parse_csv(mood_file.getvalue(), 'mood')
                 
                 is_valid, message = validate_csv_format(mood_df, 'mood')
                 if is_valid:
+                    mood_df = mood_df.set_index('date').sort_index()
                     st.session_state.mood_data = mood_df
                     st.success(f"✅ Loaded {len(mood_df)} days of wellbeing data")
                     st.dataframe(mood_df.head(), use_container_width=True)
@@ -475,10 +682,8 @@ date,mood_score,stress_level,sleep_hours
     if st.session_state.work_data is not None and st.session_state.mood_data is not None:
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
-            if st.button("🔍 Analyze Rhythm", key="analyze"):
-                st.session_state.page = 'processing'
-                st.session_state.analysis_complete = False
-                st.rerun()
+            st.button("🔍 Analyze Rhythm", key="analyze", on_click=_go_to,
+                      args=('processing',), kwargs={'analysis_complete': False})
     else:
         st.warning("⚠️ Please upload both CSV files to proceed with analysis")
     
@@ -486,27 +691,7 @@ date,mood_score,stress_level,sleep_hours
     st.markdown("<br><br>", unsafe_allow_html=True)
     with st.expander("🎲 Don't have data? Use sample dataset"):
         if st.button("Load Sample Data"):
-            # Generate sample data
-            dates = pd.date_range(start='2025-01-01', periods=30, freq='D')
-            
-            # Sample work data
-            work_data = pd.DataFrame({
-                'date': dates,
-                'work_hours': np.random.normal(8, 1.5, 30).clip(5, 12),
-                'tasks_completed': np.random.poisson(10, 30),
-                'server_uptime': np.random.uniform(98, 100, 30)
-            })
-            
-            # Sample mood data (inversely correlated with work hours)
-            mood_data = pd.DataFrame({
-                'date': dates,
-                'mood_score': (10 - work_data['work_hours'] * 0.5 + np.random.normal(0, 1, 30)).clip(1, 10),
-                'stress_level': (work_data['work_hours'] * 0.5 + np.random.normal(0, 1, 30)).clip(1, 10),
-                'sleep_hours': (9 - work_data['work_hours'] * 0.2 + np.random.normal(0, 0.5, 30)).clip(5, 9)
-            })
-            
-            st.session_state.work_data = work_data
-            st.session_state.mood_data = mood_data
+            st.session_state.work_data, st.session_state.mood_data = _make_sample()
             st.success("✅ Sample data loaded! Click 'Analyze Rhythm' to continue.")
             st.rerun()
 
@@ -514,35 +699,54 @@ date,mood_score,stress_level,sleep_hours
 # PAGE 3: AI PROCESSING PAGE
 # ==============================================================================
 
+_PROCESSING_HEADER_HTML = """
+    <div style='text-align: center; padding: 2rem 0;'>
+        <h1 style='background: linear-gradient(135deg, #00D9FF 0%, #FF6B9D 100%); 
+                   -webkit-background-clip: text; -webkit-text-fill-color: transparent;'>
+            🧠 Analyzing Your Rhythm
+        </h1>
+        <p style='font-size: 1.2rem; color: #94a3b8;'>
+            AI is processing your data patterns...
+        </p>
+    </div>
+"""
+
+_PROCESSING_ICON_HTML = """
+    <div style='text-align: center; font-size: 5rem; margin: 2rem 0;'>
+        🤖❤️
+    </div>
+"""
+
 def processing_page():
     """AI processing animation and analysis"""
     
-    st.markdown("""
-        <div style='text-align: center; padding: 2rem 0;'>
-            <h1 style='background: linear-gradient(135deg, #00D9FF 0%, #FF6B9D 100%); 
-                       -webkit-background-clip: text; -webkit-text-fill-color: transparent;'>
-                🧠 Analyzing Your Rhythm
-            </h1>
-            <p style='font-size: 1.2rem; color: #94a3b8;'>
-                AI is processing your data patterns...
-            </p>
-        </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_PROCESSING_HEADER_HTML, unsafe_allow_html=True)
     
     # Center the progress animation
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
         # Animated icon
-        st.markdown("""
-            <div style='text-align: center; font-size: 5rem; margin: 2rem 0;'>
-                🤖❤️
-            </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_PROCESSING_ICON_HTML, unsafe_allow_html=True)
         
         # Progress bar
         progress_bar = st.progress(0)
         status_text = st.empty()
         
+        # Perform actual analysis first; the steps below only report progress
+        if not st.session_state.analysis_complete:
+            with st.spinner('Finalizing analysis...'):
+                analysis_results = calculate_rhythm_score(
+                    st.session_state.work_data,
+                    st.session_state.mood_data
+                )
+            if analysis_results is None:
+                st.error("❌ Work and mood CSVs have no overlapping dates.")
+                st.button("← Back to Upload", on_click=_go_to, args=('upload',))
+                return
+            analysis_results['arrays'] = RhythmArrays(*analysis_results['arrays'])
+            st.session_state.rhythm_score = analysis_results
+            st.session_state.analysis_complete = True
+        
         # Processing steps
         steps = [
             ("Parsing CSV data and validating formats", 20),
@@ -559,25 +763,269 @@ def processing_page():
                 </div>
             """, unsafe_allow_html=True)
             progress_bar.progress(progress)
-            time.sleep(0.8)  # Simulate processing time
-        
-        # Perform actual analysis
-        if not st.session_state.analysis_complete:
-            with st.spinner('Finalizing analysis...'):
-                analysis_results = calculate_rhythm_score(
-                    st.session_state.work_data,
-                    st.session_state.mood_data
-                )
-                st.session_state.rhythm_score = analysis_results
-                st.session_state.analysis_complete = True
         
         st.success("✅ Analysis Complete!")
-        time.sleep(1)
         
         # Navigate to dashboard
         st.session_state.page = 'dashboard'
         st.rerun()
 
+# ==============================================================================
+# CHART BUILDERS
+# ==============================================================================
+# Figures are cached on the plain arrays they plot, so reruns reuse the built
+# Figure; uirevision keeps zoom and legend state when it is re-sent
+
+# Shared dark styling, layered over Streamlit's default Plotly template;
+# figures only set what differs from it
+if 'rhythm' not in pio.templates:
+    pio.templates['rhythm'] = go.layout.Template(layout={
+        'paper_bgcolor': "rgba(0,0,0,0)",
+        'plot_bgcolor': "rgba(21, 27, 59, 0.5)",
+        'font': {'color': "white"},
+        'xaxis': {'gridcolor': 'rgba(255,255,255,0.1)'},
+        'yaxis': {'gridcolor': 'rgba(255,255,255,0.1)'}
+    })
+_PLOTLY_TEMPLATE = 'streamlit+rhythm'
+
+@st.cache_data(show_spinner=False)
+def _build_gauge(rhythm_score, color):
+    """Rhythm score gauge with the status bands"""
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=rhythm_score,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': "Overall Rhythm Score", 'font': {'size': 24, 'color': '#B794F6'}},
+        number={'font': {'size': 60, 'color': color}},
+        gauge={
+            'axis': {'range': [0, 100], 'tickwidth': 1, 'tickcolor': "gray"},
+            'bar': {'color': color},
+            'bgcolor': "rgba(255,255,255,0.1)",
+            'borderwidth': 2,
+            'bordercolor': "gray",
+            'steps': [
+                {'range': [0, 45], 'color': 'rgba(248, 113, 113, 0.2)'},
+                {'range': [45, 60], 'color': 'rgba(251, 191, 36, 0.2)'},
+                {'range': [60, 75], 'color': 'rgba(183, 148, 246, 0.2)'},
+                {'range': [75, 100], 'color': 'rgba(74, 222, 128, 0.2)'}
+            ],
+            'threshold': {
+                'line': {'color': "white", 'width': 4},
+                'thickness': 0.75,
+                'value': 75
+            }
+        }
+    ))
+    
+    fig.update_layout(
+        template=_PLOTLY_TEMPLATE,
+        plot_bgcolor="rgba(0,0,0,0)",
+        font={'family': "Arial"},
+        height=400,
+        uirevision='rhythm'
+    )
+    
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _build_trend_fig(dates, work_hours, mood, work_max):
+    """Dual-axis work hours vs mood chart"""
+    fig = go.Figure()
+    
+    # Add work hours trace
+    fig.add_trace(go.Scattergl(
+        x=dates,
+        y=work_hours,
+        name='Work Hours',
+        line=dict(color='#00D9FF', width=3),
+        fill='tozeroy',
+        fillcolor='rgba(0, 217, 255, 0.1)'
+    ))
+    
+    # Add mood score trace on its own 0-10 axis
+    fig.add_trace(go.Scattergl(
+        x=dates,
+        y=mood,
+        name='Mood Score',
+        line=dict(color='#FF6B9D', width=3),
+        fill='tozeroy',
+        fillcolor='rgba(255, 107, 157, 0.1)',
+        yaxis='y2'
+    ))
+    
+    fig.update_layout(
+        template=_PLOTLY_TEMPLATE,
+        xaxis=dict(title="Date"),
+        yaxis=dict(title="Work Hours", range=[0, work_max + 2]),
+        yaxis2=dict(
+            title="Mood Score",
+            overlaying='y',
+            side='right',
+            gridcolor='rgba(255,255,255,0.05)',
+            range=[0, 11]
+        ),
+        hovermode='x unified',
+        height=400,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        uirevision='rhythm'
+    )
+    
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _build_heatmap(z, x, y):
+    """Weekday x week work-intensity heatmap"""
+    fig = go.Figure(data=go.Heatmap(
+        z=z,
+        x=x,
+        y=y,
+        colorscale=[[0, '#1a1f4d'], [0.5, '#B794F6'], [1, '#00D9FF']],
+        text=z.round(1),
+        texttemplate='%{text}h',
+        textfont={"size": 10},
+        hoverongaps=False
+    ))
+    
+    fig.update_layout(
+        template=_PLOTLY_TEMPLATE,
+        plot_bgcolor="rgba(0,0,0,0)",
+        height=300,
+        uirevision='rhythm'
+    )
+    
+    return fig
+
+def _box_data(values):
+    """Box trace data: raw values for short series, else Plotly's precomputed summary
+    (linear quartiles, 1.5 IQR whiskers, mean/sd) so only a few numbers are sent"""
+    values = values[~np.isnan(values)]
+    if values.size <= _BOX_RAW_MAX_POINTS:
+        return {'y': values}
+    
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    return {
+        'q1': [q1], 'median': [median], 'q3': [q3],
+        'lowerfence': [values[values >= q1 - 1.5 * iqr].min()],
+        'upperfence': [values[values <= q3 + 1.5 * iqr].max()],
+        'mean': [values.mean()], 'sd': [values.std()]
+    }
+
+@st.cache_data(show_spinner=False)
+def _build_mood_box(mood, stress):
+    """Mood and inverted stress distributions"""
+    fig = go.Figure()
+    
+    fig.add_trace(go.Box(
+        **_box_data(mood),
+        name='Mood Score',
+        marker_color='#FF6B9D',
+        boxmean='sd'
+    ))
+    
+    fig.add_trace(go.Box(
+        **_box_data(10 - stress),
+        name='Low Stress (inverted)',
+        marker_color='#B794F6',
+        boxmean='sd'
+    ))
+    
+    fig.update_layout(
+        template=_PLOTLY_TEMPLATE,
+        yaxis=dict(title="Score (1-10)", range=[0, 11]),
+        height=300,
+        showlegend=True,
+        uirevision='rhythm'
+    )
+    
+    return fig
+
+# ==============================================================================
+# HTML TEMPLATES
+# ==============================================================================
+# Static shells parsed once at import; pages substitute only the dynamic fields
+
+# Week-over-week trend bands (declining, stable, improving): (emoji, text, color)
+_TREND_STYLES = (
+    ("📉", "declining", "#F87171"),
+    ("➡️", "stable", "#FBBF24"),
+    ("📈", "improving", "#4ADE80")
+)
+
+# Plotly config for display-only charts: no event handlers or mode bar
+_STATIC_PLOT_CONFIG = {'staticPlot': True, 'displayModeBar': False}
+
+# Rhythm score status bands: bisect the score into (status, color)
+_STATUS_THRESHOLDS = (45, 60, 75)
+_STATUS_STYLES = (
+    ("Needs Attention", "#F87171"),
+    ("Moderate", "#FBBF24"),
+    ("Balanced", "#B794F6"),
+    ("Excellent", "#4ADE80")
+)
+
+_SCORE_CARD = Template("""
+    <div style='text-align: center; padding: 1rem 3rem 2rem; background: linear-gradient(135deg, rgba(0, 217, 255, 0.1) 0%, rgba(255, 107, 157, 0.1) 100%); 
+                border-radius: 30px; margin-bottom: 3.5rem; box-shadow: 0 10px 40px rgba(183, 148, 246, 0.2);'>
+        <div style='font-size: 1.5rem; color: $color; font-weight: bold;'>
+            $status
+        </div>
+        <div style='display: flex; justify-content: center; gap: 3rem; margin-top: 2rem;'>
+            <div style='text-align: center;'>
+                <div style='color: #00D9FF; font-size: 2rem; font-weight: bold;'>🤖 $machine_score</div>
+                <div style='color: #94a3b8;'>Machine Score</div>
+            </div>
+            <div style='text-align: center;'>
+                <div style='color: #FF6B9D; font-size: 2rem; font-weight: bold;'>❤️ $human_score</div>
+                <div style='color: #94a3b8;'>Human Score</div>
+            </div>
+        </div>
+    </div>
+""")
+
+# Most alerts shown in the dashboard side panel
+_MAX_ALERTS = 5
+
+_ALERT_BOX = Template("""
+    <div class='alert-$type'>
+        <strong>$icon $title</strong><br>
+        <small>$description</small>
+    </div>
+""")
+
+_ALERTS_ALL_CLEAR = """
+    <div class='alert-success'>
+        <strong>✅ All Clear!</strong><br>
+        No major imbalances detected. Keep up the good work!
+    </div>
+"""
+
+# Insight card colours keyed by insight['color']
+_INSIGHT_BG_COLORS = {
+    'machine': 'rgba(0, 217, 255, 0.05)',
+    'human': 'rgba(255, 107, 157, 0.05)',
+    'balance': 'rgba(183, 148, 246, 0.05)'
+}
+_INSIGHT_BORDER_COLORS = {
+    'machine': '#00D9FF',
+    'human': '#FF6B9D',
+    'balance': '#B794F6'
+}
+
+_INSIGHT_CARD = Template("""
+    <div style='padding: 2rem; background: $bg_color; 
+                border-left: 4px solid $border_color; border-radius: 15px; 
+                margin-bottom: 1.5rem; min-height: 250px;'>
+        <div style='font-size: 2.5rem; margin-bottom: 1rem;'>$icon</div>
+        <h3 style='color: white; margin-bottom: 1rem;'>$title</h3>
+        <p style='color: #94a3b8; margin-bottom: 1rem;'>$description</p>
+        <div style='background: rgba(0,0,0,0.3); padding: 1rem; border-radius: 10px;'>
+            <strong style='color: $border_color;'>💡 Recommendation:</strong><br>
+            <span style='color: #cbd5e1; font-size: 0.95rem;'>$recommendation</span>
+        </div>
+    </div>
+""")
+
 # ==============================================================================
 # PAGE 4: DASHBOARD / RESULTS PAGE
 # ==============================================================================
@@ -587,115 +1035,50 @@ def dashboard_page():
     
     if st.session_state.rhythm_score is None:
         st.error("No analysis results found. Please upload data first.")
-        if st.button("← Back to Upload"):
-            st.session_state.page = 'upload'
-            st.rerun()
+        st.button("← Back to Upload", on_click=_go_to, args=('upload',))
         return
     
     results = st.session_state.rhythm_score
-    merged_df = results['merged_data']
+    merged_df, display_df, ra = results['merged_data'], results['merged_data_display'], results['arrays']
     
     # Header
     col1, col2 = st.columns([3, 1])
     with col1:
-        st.markdown("""
+        st.markdown(f"""
             <h1 style='background: linear-gradient(135deg, #00D9FF 0%, #FF6B9D 100%); 
                        -webkit-background-clip: text; -webkit-text-fill-color: transparent;'>
                 📊 Your Rhythm Dashboard
             </h1>
+            <p style='color: #94a3b8; font-size: 1.1rem; margin-bottom: 1.5rem;'>Analysis Period: {merged_df['date'].min().strftime('%b %d')} - {merged_df['date'].max().strftime('%b %d, %Y')}</p>
         """, unsafe_allow_html=True)
-        st.markdown(f"<p style='color: #94a3b8; font-size: 1.1rem;'>Analysis Period: {merged_df['date'].min().strftime('%b %d')} - {merged_df['date'].max().strftime('%b %d, %Y')}</p>", unsafe_allow_html=True)
     
     with col2:
         if st.button("📥 Export Report"):
             st.info("Report export functionality - placeholder for CSV/PDF download")
     
-    st.markdown("<br>", unsafe_allow_html=True)
-    
     # Central Rhythm Score
-    st.markdown("""
-        <div style='text-align: center; padding: 3rem; background: linear-gradient(135deg, rgba(0, 217, 255, 0.1) 0%, rgba(255, 107, 157, 0.1) 100%); 
-                    border-radius: 30px; margin-bottom: 2rem; box-shadow: 0 10px 40px rgba(183, 148, 246, 0.2);'>
-    """, unsafe_allow_html=True)
-    
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
         # Create circular gauge visualization
         rhythm_score = results['rhythm_score']
         
         # Determine status and color
-        if rhythm_score >= 75:
-            status = "Excellent"
-            color = "#4ADE80"
-        elif rhythm_score >= 60:
-            status = "Balanced"
-            color = "#B794F6"
-        elif rhythm_score >= 45:
-            status = "Moderate"
-            color = "#FBBF24"
-        else:
-            status = "Needs Attention"
-            color = "#F87171"
-        
-        fig = go.Figure(go.Indicator(
-            mode="gauge+number+delta",
-            value=rhythm_score,
-            domain={'x': [0, 1], 'y': [0, 1]},
-            title={'text': "Overall Rhythm Score", 'font': {'size': 24, 'color': '#B794F6'}},
-            number={'font': {'size': 60, 'color': color}},
-            gauge={
-                'axis': {'range': [0, 100], 'tickwidth': 1, 'tickcolor': "gray"},
-                'bar': {'color': color},
-                'bgcolor': "rgba(255,255,255,0.1)",
-                'borderwidth': 2,
-                'bordercolor': "gray",
-                'steps': [
-                    {'range': [0, 45], 'color': 'rgba(248, 113, 113, 0.2)'},
-                    {'range': [45, 60], 'color': 'rgba(251, 191, 36, 0.2)'},
-                    {'range': [60, 75], 'color': 'rgba(183, 148, 246, 0.2)'},
-                    {'range': [75, 100], 'color': 'rgba(74, 222, 128, 0.2)'}
-                ],
-                'threshold': {
-                    'line': {'color': "white", 'width': 4},
-                    'thickness': 0.75,
-                    'value': 75
-                }
-            }
-        ))
-        
-        fig.update_layout(
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            font={'color': "white", 'family': "Arial"},
-            height=400
-        )
+        status, color = _STATUS_STYLES[bisect_right(_STATUS_THRESHOLDS, rhythm_score)]
         
-        st.plotly_chart(fig, use_container_width=True)
+        fig = _build_gauge(rhythm_score, color)
         
-        st.markdown(f"""
-            <div style='text-align: center; font-size: 1.5rem; color: {color}; font-weight: bold; margin-top: -2rem;'>
-                {status}
-            </div>
-        """, unsafe_allow_html=True)
+        # The gauge has nothing to hover or zoom: draw it as a static plot
+        st.plotly_chart(fig, use_container_width=True, config=_STATIC_PLOT_CONFIG)
         
-        # Component scores
-        st.markdown(f"""
-            <div style='display: flex; justify-content: center; gap: 3rem; margin-top: 2rem;'>
-                <div style='text-align: center;'>
-                    <div style='color: #00D9FF; font-size: 2rem; font-weight: bold;'>🤖 {results['machine_score']}</div>
-                    <div style='color: #94a3b8;'>Machine Score</div>
-                </div>
-                <div style='text-align: center;'>
-                    <div style='color: #FF6B9D; font-size: 2rem; font-weight: bold;'>❤️ {results['human_score']}</div>
-                    <div style='color: #94a3b8;'>Human Score</div>
-                </div>
-            </div>
-        """, unsafe_allow_html=True)
-    
-    st.markdown("</div>", unsafe_allow_html=True)
+        # Status pill and component scores in one score card
+        st.markdown(_SCORE_CARD.substitute(
+            status=status,
+            color=color,
+            machine_score=results['machine_score'],
+            human_score=results['human_score']
+        ), unsafe_allow_html=True)
     
     # Stats Cards
-    st.markdown("<br>", unsafe_allow_html=True)
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
@@ -727,55 +1110,18 @@ def dashboard_page():
             delta=corr_status
         )
     
-    st.markdown("<br><br>", unsafe_allow_html=True)
-    
     # Main Chart and Alerts Section
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        st.markdown("### 📈 Productivity vs Wellbeing Trends")
-        
-        # Create dual-axis chart
-        fig = go.Figure()
-        
-        # Add work hours trace
-        fig.add_trace(go.Scatter(
-            x=merged_df['date'],
-            y=merged_df['work_hours'],
-            name='Work Hours',
-            line=dict(color='#00D9FF', width=3),
-            fill='tozeroy',
-            fillcolor='rgba(0, 217, 255, 0.1)'
-        ))
+        st.markdown("<div class='section-gap'></div>\n\n### 📈 Productivity vs Wellbeing Trends", unsafe_allow_html=True)
         
-        # Add mood score trace (scaled to match work hours range)
-        mood_scaled = merged_df['mood_score'] * (merged_df['work_hours'].max() / 10)
-        fig.add_trace(go.Scatter(
-            x=merged_df['date'],
-            y=mood_scaled,
-            name='Mood Score',
-            line=dict(color='#FF6B9D', width=3),
-            fill='tozeroy',
-            fillcolor='rgba(255, 107, 157, 0.1)',
-            yaxis='y2'
-        ))
-        
-        fig.update_layout(
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(21, 27, 59, 0.5)",
-            font={'color': "white"},
-            xaxis=dict(title="Date", gridcolor='rgba(255,255,255,0.1)'),
-            yaxis=dict(title="Work Hours", gridcolor='rgba(255,255,255,0.1)', range=[0, merged_df['work_hours'].max() + 2]),
-            yaxis2=dict(
-                title="Mood Score",
-                overlaying='y',
-                side='right',
-                gridcolor='rgba(255,255,255,0.05)',
-                range=[0, 10 * (merged_df['work_hours'].max() / 10) + 2]
-            ),
-            hovermode='x unified',
-            height=400,
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        # Create dual-axis chart from the LTTB-downsampled rows
+        fig = _build_trend_fig(
+            display_df['date'].to_numpy(),
+            display_df['work_hours'].to_numpy(),
+            display_df['mood_score'].to_numpy(),
+            float(np.nanmax(ra.work_hours))
         )
         
         st.plotly_chart(fig, use_container_width=True)
@@ -794,106 +1140,43 @@ def dashboard_page():
         """, unsafe_allow_html=True)
     
     with col2:
-        st.markdown("### 🚨 Active Alerts")
+        st.markdown("<div class='section-gap'></div>\n\n### 🚨 Active Alerts", unsafe_allow_html=True)
         
         # Detect and display anomalies
-        anomalies = detect_anomalies(merged_df)
+        anomalies = detect_anomalies(results['data_key'], ra)
         
         if not anomalies:
-            st.markdown("""
-                <div class='alert-success'>
-                    <strong>✅ All Clear!</strong><br>
-                    No major imbalances detected. Keep up the good work!
-                </div>
-            """, unsafe_allow_html=True)
+            alerts_html = _ALERTS_ALL_CLEAR
         else:
-            for anomaly in anomalies:
-                alert_class = f"alert-{anomaly['type']}"
-                st.markdown(f"""
-                    <div class='{alert_class}'>
-                        <strong>{anomaly['icon']} {anomaly['title']}</strong><br>
-                        <small>{anomaly['description']}</small>
-                    </div>
-                """, unsafe_allow_html=True)
+            alerts_html = "".join(_ALERT_BOX.substitute(anomaly) for anomaly in anomalies[:_MAX_ALERTS])
         
-        st.markdown("<br>", unsafe_allow_html=True)
+        st.markdown(alerts_html + "<br>", unsafe_allow_html=True)
         
         # Navigation to insights
-        if st.button("💡 View Detailed Insights", key="view_insights"):
-            st.session_state.page = 'insights'
-            st.rerun()
+        st.button("💡 View Detailed Insights", key="view_insights", on_click=_go_to, args=('insights',))
     
     # Additional visualizations
-    st.markdown("<br><br>", unsafe_allow_html=True)
-    
     col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown("### 🔥 Work Intensity Heatmap")
+        st.markdown("<div class='section-gap'></div>\n\n### 🔥 Work Intensity Heatmap", unsafe_allow_html=True)
         
         # Create a weekly heatmap
-        merged_df['day_of_week'] = merged_df['date'].dt.day_name()
-        merged_df['week'] = merged_df['date'].dt.isocalendar().week
+        pivot_data = _heatmap_pivot(results['data_key'], merged_df)
         
-        pivot_data = merged_df.pivot_table(
-            values='work_hours',
-            index='day_of_week',
-            columns='week',
-            aggfunc='mean'
-        )
-        
-        # Reorder days of week
-        day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        pivot_data = pivot_data.reindex([day for day in day_order if day in pivot_data.index])
-        
-        fig = go.Figure(data=go.Heatmap(
-            z=pivot_data.values,
-            x=[f"Week {int(w)}" for w in pivot_data.columns],
-            y=pivot_data.index,
-            colorscale=[[0, '#1a1f4d'], [0.5, '#B794F6'], [1, '#00D9FF']],
-            text=pivot_data.values.round(1),
-            texttemplate='%{text}h',
-            textfont={"size": 10},
-            hoverongaps=False
-        ))
-        
-        fig.update_layout(
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            font={'color': "white"},
-            height=300
+        fig = _build_heatmap(
+            pivot_data.to_numpy(),
+            [f"Week {int(w)}" for w in pivot_data.columns],
+            pivot_data.index.to_numpy()
         )
         
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
-        st.markdown("### 😊 Mood Distribution")
+        st.markdown("<div class='section-gap'></div>\n\n### 😊 Mood Distribution", unsafe_allow_html=True)
         
         # Create mood distribution chart
-        fig = go.Figure()
-        
-        fig.add_trace(go.Box(
-            y=merged_df['mood_score'],
-            name='Mood Score',
-            marker_color='#FF6B9D',
-            boxmean='sd'
-        ))
-        
-        fig.add_trace(go.Box(
-            y=10 - merged_df['stress_level'],
-            name='Low Stress (inverted)',
-            marker_color='#B794F6',
-            boxmean='sd'
-        ))
-        
-        fig.update_layout(
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(21, 27, 59, 0.5)",
-            font={'color': "white"},
-            yaxis=dict(title="Score (1-10)", gridcolor='rgba(255,255,255,0.1)', range=[0, 11]),
-            height=300,
-            showlegend=True
-        )
+        fig = _build_mood_box(ra.mood, ra.stress)
         
         st.plotly_chart(fig, use_container_width=True)
 
@@ -906,12 +1189,11 @@ def insights_page():
     
     if st.session_state.rhythm_score is None:
         st.error("No analysis results found. Please upload data first.")
-        if st.button("← Back to Upload"):
-            st.session_state.page = 'upload'
-            st.rerun()
+        st.button("← Back to Upload", on_click=_go_to, args=('upload',))
         return
     
     results = st.session_state.rhythm_score
+    merged_df, ra = results['merged_data'], results['arrays']
     
     # Header
     st.markdown("""
@@ -925,68 +1207,34 @@ def insights_page():
     """, unsafe_allow_html=True)
     
     # Generate insights
-    insights = generate_insights(results)
+    insights = generate_insights(
+        results['data_key'],
+        results['correlation'],
+        float(results['corr_matrix'][_SCORE_COL_IDX['sleep_hours'], _SCORE_COL_IDX['mood_score']]),
+        ra
+    )
     
     # Display insights in a grid
     cols = st.columns(2)
     for idx, insight in enumerate(insights):
         with cols[idx % 2]:
             # Determine background color based on insight type
-            bg_colors = {
-                'machine': 'rgba(0, 217, 255, 0.05)',
-                'human': 'rgba(255, 107, 157, 0.05)',
-                'balance': 'rgba(183, 148, 246, 0.05)'
-            }
-            border_colors = {
-                'machine': '#00D9FF',
-                'human': '#FF6B9D',
-                'balance': '#B794F6'
-            }
-            
-            bg_color = bg_colors.get(insight['color'], bg_colors['balance'])
-            border_color = border_colors.get(insight['color'], border_colors['balance'])
-            
-            st.markdown(f"""
-                <div style='padding: 2rem; background: {bg_color}; 
-                            border-left: 4px solid {border_color}; border-radius: 15px; 
-                            margin-bottom: 1.5rem; min-height: 250px;'>
-                    <div style='font-size: 2.5rem; margin-bottom: 1rem;'>{insight['icon']}</div>
-                    <h3 style='color: white; margin-bottom: 1rem;'>{insight['title']}</h3>
-                    <p style='color: #94a3b8; margin-bottom: 1rem;'>{insight['description']}</p>
-                    <div style='background: rgba(0,0,0,0.3); padding: 1rem; border-radius: 10px;'>
-                        <strong style='color: {border_color};'>💡 Recommendation:</strong><br>
-                        <span style='color: #cbd5e1; font-size: 0.95rem;'>{insight['recommendation']}</span>
-                    </div>
-                </div>
-            """, unsafe_allow_html=True)
+            color_key = insight['color'] if insight['color'] in _INSIGHT_BG_COLORS else 'balance'
+            st.markdown(_INSIGHT_CARD.substitute(
+                insight,
+                bg_color=_INSIGHT_BG_COLORS[color_key],
+                border_color=_INSIGHT_BORDER_COLORS[color_key]
+            ), unsafe_allow_html=True)
     
     st.markdown("<br><br>", unsafe_allow_html=True)
     
     # Historical Trends Section
     st.markdown("### 📊 Historical Rhythm Trends")
     
-    merged_df = results['merged_data']
-    
     # Calculate weekly rhythm scores
-    merged_df['week'] = merged_df['date'].dt.isocalendar().week
-    weekly_scores = []
-    
-    for week in merged_df['week'].unique():
-        week_data = merged_df[merged_df['week'] == week]
-        week_machine = (week_data['work_hours'].mean() / 8 * 50 + week_data['tasks_completed'].mean() / 10 * 50)
-        week_human = (week_data['mood_score'].mean() / 10 * 40 + 
-                     (10 - week_data['stress_level'].mean()) / 10 * 30 + 
-                     week_data['sleep_hours'].mean() / 8 * 30)
-        week_rhythm = (week_machine + week_human) / 2
-        weekly_scores.append({
-            'week': f"Week {int(week)}",
-            'score': round(week_rhythm, 1),
-            'machine': round(week_machine, 1),
-            'human': round(week_human, 1)
-        })
+    weekly_df = _weekly_scores(results['data_key'], merged_df)
     
     # Create trend visualization
-    weekly_df = pd.DataFrame(weekly_scores)
     
     fig = go.Figure()
     
@@ -1005,7 +1253,7 @@ def insights_page():
     ))
     
     # Add trend line
-    fig.add_trace(go.Scatter(
+    fig.add_trace(go.Scattergl(
         x=weekly_df['week'],
         y=weekly_df['score'],
         mode='lines+markers',
@@ -1015,23 +1263,21 @@ def insights_page():
     ))
     
     fig.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(21, 27, 59, 0.5)",
-        font={'color': "white"},
-        yaxis=dict(title="Rhythm Score", gridcolor='rgba(255,255,255,0.1)', range=[0, 100]),
-        xaxis=dict(title="Time Period", gridcolor='rgba(255,255,255,0.1)'),
+        template=_PLOTLY_TEMPLATE,
+        yaxis=dict(title="Rhythm Score", range=[0, 100]),
+        xaxis=dict(title="Time Period"),
         height=400,
-        showlegend=False
+        showlegend=False,
+        uirevision='rhythm'
     )
     
     st.plotly_chart(fig, use_container_width=True)
     
     # Trend analysis
-    if len(weekly_scores) >= 2:
-        trend = weekly_scores[-1]['score'] - weekly_scores[0]['score']
-        trend_emoji = "📈" if trend > 5 else "📉" if trend < -5 else "➡️"
-        trend_text = "improving" if trend > 5 else "declining" if trend < -5 else "stable"
-        trend_color = "#4ADE80" if trend > 5 else "#F87171" if trend < -5 else "#FBBF24"
+    if len(weekly_df) >= 2:
+        trend = float(weekly_df['score'].iat[-1] - weekly_df['score'].iat[0])
+        # 0 = declining (< -5), 1 = stable, 2 = improving (> 5)
+        trend_emoji, trend_text, trend_color = _TREND_STYLES[(trend > 5) - (trend < -5) + 1]
         
         st.markdown(f"""
             <div style='text-align: center; padding: 2rem; background: rgba(183, 148, 246, 0.1); 
@@ -1041,7 +1287,7 @@ def insights_page():
                     Your rhythm is {trend_text}
                 </p>
                 <p style='color: #94a3b8;'>
-                    {abs(trend):.1f} point {'increase' if trend > 0 else 'decrease'} from week 1 to week {len(weekly_scores)}
+                    {abs(trend):.1f} point {'increase' if trend > 0 else 'decrease'} from week 1 to week {len(weekly_df)}
                 </p>
             </div>
         """, unsafe_allow_html=True)
@@ -1052,32 +1298,24 @@ def insights_page():
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        if st.button("📥 Download Full Report", use_container_width=True):
-            # Create a comprehensive report CSV
-            report_df = merged_df.copy()
-            report_df['rhythm_score'] = results['rhythm_score']
-            report_df['machine_score'] = results['machine_score']
-            report_df['human_score'] = results['human_score']
-            
-            csv = report_df.to_csv(index=False)
-            st.download_button(
-                label="💾 Download CSV",
-                data=csv,
-                file_name=f"rhythm_report_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv",
-                use_container_width=True
-            )
+        # Create a comprehensive report CSV (cached bytes, one click to download)
+        st.download_button(
+            label="📥 Download Full Report",
+            data=_report_csv_bytes(
+                results['data_key'], merged_df,
+                results['rhythm_score'], results['machine_score'], results['human_score']
+            ),
+            file_name=f"rhythm_report_{datetime.now().strftime('%Y%m%d')}.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
     
     with col2:
-        if st.button("🔄 Re-analyze Data", use_container_width=True):
-            st.session_state.page = 'upload'
-            st.session_state.analysis_complete = False
-            st.rerun()
+        st.button("🔄 Re-analyze Data", use_container_width=True, on_click=_go_to,
+                  args=('upload',), kwargs={'analysis_complete': False})
     
     with col3:
-        if st.button("📊 Back to Dashboard", use_container_width=True):
-            st.session_state.page = 'dashboard'
-            st.rerun()
+        st.button("📊 Back to Dashboard", use_container_width=True, on_click=_go_to, args=('dashboard',))
 
 # ==============================================================================
 # MAIN APP ROUTER
@@ -1100,23 +1338,13 @@ def main():
         
         st.markdown("---")
         
-        # Navigation menu
-        if st.button("🏠 Home", use_container_width=True):
-            st.session_state.page = 'home'
-            st.rerun()
-        
-        if st.button("📤 Upload Data", use_container_width=True):
-            st.session_state.page = 'upload'
-            st.rerun()
+        # Navigation menu (callbacks switch page before the rerun renders it)
+        st.button("🏠 Home", use_container_width=True, on_click=_go_to, args=('home',))
+        st.button("📤 Upload Data", use_container_width=True, on_click=_go_to, args=('upload',))
         
         if st.session_state.analysis_complete:
-            if st.button("📊 Dashboard", use_container_width=True):
-                st.session_state.page = 'dashboard'
-                st.rerun()
-            
-            if st.button("💡 Insights", use_container_width=True):
-                st.session_state.page = 'insights'
-                st.rerun()
+            st.button("📊 Dashboard", use_container_width=True, on_click=_go_to, args=('dashboard',))
+            st.button("💡 Insights", use_container_width=True, on_click=_go_to, args=('insights',))
         
         st.markdown("---")
         st.markdown("""
@@ -22,14 +22,14 @@ st.set_page_config(
 # -------------------------------
 # Initialize session state
 # -------------------------------
-for key in ["work_data", "mood_data", "rhythm_score", "analysis_complete"]:
+for key in ["work_data", "mood_data", "rhythm_score", "date_meta", "weekly_df", "work_pivot", "analysis_complete"]:
     if key not in st.session_state:
         st.session_state[key] = None
 
 # -------------------------------
 # Custom Sidebar
 # -------------------------------
-st.markdown("""
+SIDEBAR_CSS = """
 <style>
 /* Sidebar overall style */
 [data-testid="stSidebar"] > div:first-child {
@@ -72,12 +72,16 @@ st.markdown("""
 }
 </style>
 
-""", unsafe_allow_html=True)
+"""
+
+# Static markup is held in constants; Streamlit rebuilds the page on every
+# rerun, so it is still emitted each time
+st.markdown(SIDEBAR_CSS, unsafe_allow_html=True)
 
 # -------------------------------
 # Hero Section with Floating Emojis
 # -------------------------------
-st.markdown("""
+HERO_HTML = """
 <div style='
     background: linear-gradient(135deg, #0f2027, #203a43, #2c5364);
     padding: 6rem 2rem; 
@@ -98,14 +102,30 @@ st.markdown("""
     <!-- Floating emojis -->
  
 </div>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(HERO_HTML, unsafe_allow_html=True)
 
 st.markdown("<br>", unsafe_allow_html=True)
 
 # -------------------------------
 # Feature Cards
 # -------------------------------
-feat_col1, feat_col2, feat_col3 = st.columns(3, gap="large")
+FEATURE_CARD_TEMPLATE = """
+    <div style='
+        flex: 1;
+        background: {bg};
+        padding: 2rem 1rem;
+        border-radius: 25px;
+        text-align: center;
+        box-shadow: 0 10px 30px rgba(0,0,0,0.2);
+        transition: transform 0.3s ease;
+    ' onmouseover="this.style.transform='scale(1.05)'" onmouseout="this.style.transform='scale(1)'">
+        <div style='font-size: 3rem;'>{icon}</div>
+        <div style='font-weight: bold; font-size: 1.5rem; color: {color}; margin-top: 0.5rem;'>{title}</div>
+        <div style='font-size: 1rem; color: #94a3b8; margin-top: 0.3rem;'>{subtitle}</div>
+    </div>
+"""
 
 cards = [
     ("🧠", "AI-Powered", "Smart Analysis", "#00D9FF", "rgba(0,217,255,0.1)"),
@@ -113,21 +133,13 @@ cards = [
     ("💡", "Smart Insights", "Actionable Tips", "#FF6B9D", "rgba(255,107,157,0.1)")
 ]
 
-for col, (icon, title, subtitle, color, bg) in zip([feat_col1, feat_col2, feat_col3], cards):
-    col.markdown(f"""
-        <div style='
-            background: {bg};
-            padding: 2rem 1rem;
-            border-radius: 25px;
-            text-align: center;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-            transition: transform 0.3s ease;
-        ' onmouseover="this.style.transform='scale(1.05)'" onmouseout="this.style.transform='scale(1)'">
-            <div style='font-size: 3rem;'>{icon}</div>
-            <div style='font-weight: bold; font-size: 1.5rem; color: {color}; margin-top: 0.5rem;'>{title}</div>
-            <div style='font-size: 1rem; color: #94a3b8; margin-top: 0.3rem;'>{subtitle}</div>
-        </div>
-    """, unsafe_allow_html=True)
+# All three cards go out in one markdown element laid out as a flex row
+FEATURE_CARDS_HTML = "<div style='display: flex; gap: 2rem;'>" + "".join(
+    FEATURE_CARD_TEMPLATE.format(icon=icon, title=title, subtitle=subtitle, color=color, bg=bg)
+    for icon, title, subtitle, color, bg in cards
+) + "</div>"
+
+st.markdown(FEATURE_CARDS_HTML, unsafe_allow_html=True)
 
 st.markdown("<br><br>", unsafe_allow_html=True)
 
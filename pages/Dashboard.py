@@ -6,10 +6,18 @@
 Dashboard Page - Dark Full Page, No Sidebar
 """
 
+import io
 import streamlit as st
 import plotly.graph_objects as go
+import plotly.io as pio
+
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = "orjson"
+except ImportError:
+    pass
 from utils.styling import apply_custom_css
-from utils.analysis import detect_anomalies
+from utils.analysis import detect_anomalies, lttb_indices, work_intensity_pivot
 
 # =========================
 # Page config & CSS
@@ -18,23 +26,166 @@ st.set_page_config(page_title="Dashboard", page_icon="📊", layout="wide")
 apply_custom_css()
 
 # Hide sidebar menu & footer
-st.markdown(
-    """
-    <style>
-    /* Hide hamburger menu and footer */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    /* Full dark background */
-    .css-18e3th9 {background-color: #0f111a;}
-    </style>
-    """,
-    unsafe_allow_html=True
-)
+HIDE_MENU_CSS = """
+<style>
+/* Hide hamburger menu and footer */
+#MainMenu {visibility: hidden;}
+footer {visibility: hidden;}
+/* Full dark background */
+.css-18e3th9 {background-color: #0f111a;}
+</style>
+"""
+
+st.markdown(HIDE_MENU_CSS, unsafe_allow_html=True)
+
+# =========================
+# Cached helpers
+# =========================
+# Upper bound on points shipped to Plotly for the per-day trend traces
+MAX_TREND_POINTS = 2000
+
+# Per-cell heatmap labels are only drawn up to roughly a month of cells
+MAX_HEATMAP_LABELS = 60
+
+# Alerts use Streamlit's native status boxes, picked by anomaly type
+ALERT_TEMPLATE = "**{icon} {title}**  \n{description}"
+ALERT_BOXES = {'success': st.success, 'warning': st.warning, 'danger': st.error}
+
+
+@st.cache_data
+def _trend_rows(merged_df):
+    """LTTB-downsampled rows for the trend chart, keyed on the work-hours shape."""
+    idx = lttb_indices(
+        merged_df['date'].to_numpy().astype('int64').astype(float),
+        merged_df['work_hours'].to_numpy(dtype=float),
+        MAX_TREND_POINTS
+    )
+    return merged_df.iloc[idx]
+
+
+@st.cache_data(show_spinner=False)
+def _report_csv(merged_df):
+    """CSV export of the merged data, encoded once per dataset."""
+    buf = io.BytesIO()
+    merged_df.to_csv(buf, index=False, encoding='utf-8')
+    return buf.getvalue()
+
+
+@st.cache_data(show_spinner=False)
+def _gauge_figure(rhythm_score, color):
+    """Gauge figure as a plain dict, built once per (score, colour)."""
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=rhythm_score,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': "Overall Rhythm Score", 'font': {'size': 24, 'color': '#B794F6'}},
+        number={'font': {'size': 60, 'color': color}},
+        gauge={
+            'axis': {'range': [0, 100], 'tickwidth': 1, 'tickcolor': "gray"},
+            'bar': {'color': color},
+            'bgcolor': "rgba(255,255,255,0.1)",
+            'borderwidth': 2,
+            'bordercolor': "gray",
+            'steps': [
+                {'range': [0, 45], 'color': 'rgba(248, 113, 113, 0.2)'},
+                {'range': [45, 60], 'color': 'rgba(251, 191, 36, 0.2)'},
+                {'range': [60, 75], 'color': 'rgba(183, 148, 246, 0.2)'},
+                {'range': [75, 100], 'color': 'rgba(74, 222, 128, 0.2)'}
+            ],
+            'threshold': {'line': {'color': "white", 'width': 4}, 'thickness': 0.75, 'value': 75}
+        }
+    ))
+
+    fig.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font={'color': "white"},
+        height=400
+    )
+    return fig.to_plotly_json()
+
+
+@st.cache_data(show_spinner=False)
+def _mood_box_figure(merged_df):
+    """Mood and low-stress box plots as a plain dict, built once per dataset."""
+    fig = go.Figure()
+
+    fig.add_trace(go.Box(
+        y=merged_df['mood_score'],
+        name='Mood Score',
+        marker_color='#FF6B9D',
+        boxmean='sd'
+    ))
+
+    fig.add_trace(go.Box(
+        y=10 - merged_df['stress_level'],
+        name='Low Stress',
+        marker_color='#B794F6',
+        boxmean='sd'
+    ))
+
+    fig.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(21, 27, 59, 0.5)",
+        font={'color': "white"},
+        yaxis=dict(title="Score (1-10)", gridcolor='rgba(255,255,255,0.1)', range=[0, 11]),
+        height=300
+    )
+    return fig.to_plotly_json()
+
+
+@st.cache_data
+def _mood_scaled(merged_df):
+    """Mood scores rescaled onto the work-hours axis."""
+    return merged_df['mood_score'] * (merged_df['work_hours'].max() / 10)
+
+
+@st.cache_data(show_spinner=False)
+def _trend_figure(merged_df):
+    """Work-hours and mood trend lines as a plain dict, built once per dataset."""
+    trend_df = _trend_rows(merged_df)
+    mood_scaled = _mood_scaled(merged_df).loc[trend_df.index]
+    dates = trend_df['date'].to_numpy()
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        x=dates,
+        y=trend_df['work_hours'].to_numpy(),
+        name='Work Hours',
+        line=dict(color='#00D9FF', width=3),
+        fill='tozeroy',
+        fillcolor='rgba(0, 217, 255, 0.1)'
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=dates,
+        y=mood_scaled.to_numpy(),
+        name='Mood Score',
+        line=dict(color='#FF6B9D', width=3),
+        fill='tozeroy',
+        fillcolor='rgba(255, 107, 157, 0.1)',
+        yaxis='y2'
+    ))
+
+    fig.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(21, 27, 59, 0.5)",
+        font={'color': "white"},
+        xaxis=dict(title="Date", gridcolor='rgba(255,255,255,0.1)'),
+        yaxis=dict(title="Work Hours", gridcolor='rgba(255,255,255,0.1)'),
+        yaxis2=dict(title="Mood Score", overlaying='y', side='right'),
+        hovermode='x unified',
+        height=400,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    return fig.to_plotly_json()
+
 
 # =========================
 # Check if analysis is complete
 # =========================
-if st.session_state.rhythm_score is None:
+if st.session_state.get('rhythm_score') is None:
     st.error("No analysis results found. Please upload data first.")
     if st.button("← Back to Upload"):
         st.switch_page("pages/Upload_Data.py")
@@ -43,6 +194,17 @@ if st.session_state.rhythm_score is None:
 results = st.session_state.rhythm_score
 merged_df = results['merged_data']
 
+# Date range and weekly aggregates are computed once after analysis and shared
+# between pages; rebuild them here if Processing did not run in this session
+if st.session_state.get('date_meta') is None:
+    st.session_state.date_meta = {
+        'date_min': merged_df['date'].min(),
+        'date_max': merged_df['date'].max()
+    }
+date_meta = st.session_state.date_meta
+if st.session_state.get('work_pivot') is None:
+    st.session_state.work_pivot = work_intensity_pivot(merged_df)
+
 # =========================
 # Header
 # =========================
@@ -55,19 +217,18 @@ with col1:
         </h1>
     """, unsafe_allow_html=True)
     st.markdown(
-        f"<p style='color: #94a3b8; font-size: 1.1rem;'>Analysis Period: {merged_df['date'].min().strftime('%b %d')} - {merged_df['date'].max().strftime('%b %d, %Y')}</p>",
+        f"<p style='color: #94a3b8; font-size: 1.1rem;'>Analysis Period: {date_meta['date_min'].strftime('%b %d')} - {date_meta['date_max'].strftime('%b %d, %Y')}</p>",
         unsafe_allow_html=True
     )
 
 with col2:
-    if st.button("📥 Export Report"):
-        csv = merged_df.to_csv(index=False)
-        st.download_button(
-            label="💾 Download CSV",
-            data=csv,
-            file_name=f"rhythm_report.csv",
-            mime="text/csv"
-        )
+    # A single download button: no extra rerun to reveal it, and the CSV is cached
+    st.download_button(
+        label="📥 Export Report",
+        data=_report_csv(merged_df),
+        file_name="rhythm_report.csv",
+        mime="text/csv"
+    )
 
 st.markdown("<br>", unsafe_allow_html=True)
 
@@ -93,36 +254,7 @@ with col2:
     else:
         status, color = "Needs Attention", "#F87171"
     
-    fig = go.Figure(go.Indicator(
-        mode="gauge+number",
-        value=rhythm_score,
-        domain={'x': [0, 1], 'y': [0, 1]},
-        title={'text': "Overall Rhythm Score", 'font': {'size': 24, 'color': '#B794F6'}},
-        number={'font': {'size': 60, 'color': color}},
-        gauge={
-            'axis': {'range': [0, 100], 'tickwidth': 1, 'tickcolor': "gray"},
-            'bar': {'color': color},
-            'bgcolor': "rgba(255,255,255,0.1)",
-            'borderwidth': 2,
-            'bordercolor': "gray",
-            'steps': [
-                {'range': [0, 45], 'color': 'rgba(248, 113, 113, 0.2)'},
-                {'range': [45, 60], 'color': 'rgba(251, 191, 36, 0.2)'},
-                {'range': [60, 75], 'color': 'rgba(183, 148, 246, 0.2)'},
-                {'range': [75, 100], 'color': 'rgba(74, 222, 128, 0.2)'}
-            ],
-            'threshold': {'line': {'color': "white", 'width': 4}, 'thickness': 0.75, 'value': 75}
-        }
-    ))
-    
-    fig.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        font={'color': "white"},
-        height=400
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(_gauge_figure(rhythm_score, color), use_container_width=True)
     
     st.markdown(f"""
         <div style='text-align: center; font-size: 1.5rem; color: {color}; font-weight: bold; margin-top: -2rem;'>
@@ -131,18 +263,9 @@ with col2:
     """, unsafe_allow_html=True)
     
     # Component scores
-    st.markdown(f"""
-        <div style='display: flex; justify-content: center; gap: 3rem; margin-top: 2rem;'>
-            <div style='text-align: center;'>
-                <div style='color: #00D9FF; font-size: 2rem; font-weight: bold;'>🤖 {results['machine_score']}</div>
-                <div style='color: #94a3b8;'>Machine Score</div>
-            </div>
-            <div style='text-align: center;'>
-                <div style='color: #FF6B9D; font-size: 2rem; font-weight: bold;'>❤️ {results['human_score']}</div>
-                <div style='color: #94a3b8;'>Human Score</div>
-            </div>
-        </div>
-    """, unsafe_allow_html=True)
+    machine_col, human_col = st.columns(2)
+    machine_col.metric(label="🤖 Machine Score", value=results['machine_score'])
+    human_col.metric(label="❤️ Human Score", value=results['human_score'])
 
 st.markdown("</div>", unsafe_allow_html=True)
 
@@ -190,41 +313,7 @@ col1, col2 = st.columns([2, 1])
 with col1:
     st.markdown("### 📈 Productivity vs Wellbeing Trends")
     
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatter(
-        x=merged_df['date'],
-        y=merged_df['work_hours'],
-        name='Work Hours',
-        line=dict(color='#00D9FF', width=3),
-        fill='tozeroy',
-        fillcolor='rgba(0, 217, 255, 0.1)'
-    ))
-    
-    mood_scaled = merged_df['mood_score'] * (merged_df['work_hours'].max() / 10)
-    fig.add_trace(go.Scatter(
-        x=merged_df['date'],
-        y=mood_scaled,
-        name='Mood Score',
-        line=dict(color='#FF6B9D', width=3),
-        fill='tozeroy',
-        fillcolor='rgba(255, 107, 157, 0.1)',
-        yaxis='y2'
-    ))
-    
-    fig.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(21, 27, 59, 0.5)",
-        font={'color': "white"},
-        xaxis=dict(title="Date", gridcolor='rgba(255,255,255,0.1)'),
-        yaxis=dict(title="Work Hours", gridcolor='rgba(255,255,255,0.1)'),
-        yaxis2=dict(title="Mood Score", overlaying='y', side='right'),
-        hovermode='x unified',
-        height=400,
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(_trend_figure(merged_df), use_container_width=True)
     
     insight_type = 'success' if results['correlation'] > 0 else 'warning'
     if results['correlation'] < -0.3:
@@ -234,31 +323,17 @@ with col1:
     else:
         insight_msg = "Weak correlation between work hours and mood. Other factors may be more influential."
     
-    st.markdown(f"""
-        <div class='alert-{insight_type}'>
-            <strong>🧠 AI Insight:</strong> {insight_msg}
-        </div>
-    """, unsafe_allow_html=True)
+    ALERT_BOXES[insight_type](f"**🧠 AI Insight:** {insight_msg}")
 
 with col2:
     st.markdown("### 🚨 Active Alerts")
     anomalies = detect_anomalies(merged_df)
     
     if not anomalies:
-        st.markdown("""
-            <div class='alert-success'>
-                <strong>✅ All Clear!</strong><br>
-                No major imbalances detected. Keep up the good work!
-            </div>
-        """, unsafe_allow_html=True)
+        st.success("**✅ All Clear!**  \nNo major imbalances detected. Keep up the good work!")
     else:
         for anomaly in anomalies:
-            st.markdown(f"""
-                <div class='alert-{anomaly['type']}'>
-                    <strong>{anomaly['icon']} {anomaly['title']}</strong><br>
-                    <small>{anomaly['description']}</small>
-                </div>
-            """, unsafe_allow_html=True)
+            ALERT_BOXES[anomaly['type']](ALERT_TEMPLATE.format(**anomaly))
     
     st.markdown("<br>", unsafe_allow_html=True)
     
@@ -274,27 +349,21 @@ col1, col2 = st.columns(2)
 with col1:
     st.markdown("### 🔥 Work Intensity Heatmap")
     
-    merged_df['day_of_week'] = merged_df['date'].dt.day_name()
-    merged_df['week'] = merged_df['date'].dt.isocalendar().week
+    pivot_data = st.session_state.work_pivot
+    z = pivot_data.values.round(1)
     
-    pivot_data = merged_df.pivot_table(
-        values='work_hours',
-        index='day_of_week',
-        columns='week',
-        aggfunc='mean'
-    )
-    
-    day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    pivot_data = pivot_data.reindex([day for day in day_order if day in pivot_data.index])
+    # Label every cell only for small grids; larger ones rely on colour and hover
+    labels = {}
+    if z.size <= MAX_HEATMAP_LABELS:
+        labels = dict(text=z, texttemplate='%{text}h', textfont={"size": 10})
     
     fig = go.Figure(data=go.Heatmap(
-        z=pivot_data.values,
+        z=z,
         x=[f"Week {int(w)}" for w in pivot_data.columns],
         y=pivot_data.index,
         colorscale=[[0, '#1a1f4d'], [0.5, '#B794F6'], [1, '#00D9FF']],
-        text=pivot_data.values.round(1),
-        texttemplate='%{text}h',
-        textfont={"size": 10}
+        hovertemplate='%{y} %{x}: %{z:.1f}h<extra></extra>',
+        **labels
     ))
     
     fig.update_layout(
@@ -309,28 +378,4 @@ with col1:
 with col2:
     st.markdown("### 😊 Mood Distribution")
     
-    fig = go.Figure()
-    
-    fig.add_trace(go.Box(
-        y=merged_df['mood_score'],
-        name='Mood Score',
-        marker_color='#FF6B9D',
-        boxmean='sd'
-    ))
-    
-    fig.add_trace(go.Box(
-        y=10 - merged_df['stress_level'],
-        name='Low Stress',
-        marker_color='#B794F6',
-        boxmean='sd'
-    ))
-    
-    fig.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(21, 27, 59, 0.5)",
-        font={'color': "white"},
-        yaxis=dict(title="Score (1-10)", gridcolor='rgba(255,255,255,0.1)', range=[0, 11]),
-        height=300
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(_mood_box_figure(merged_df), use_container_width=True)
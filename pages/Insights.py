@@ -2,17 +2,19 @@
 4_💡_Insights.py - AI-generated insights and recommendations page
 """
 
+import io
 import streamlit as st
-import pandas as pd
 import plotly.graph_objects as go
-from datetime import datetime
-import sys
-from pathlib import Path
+import plotly.io as pio
 
-# Add parent directory to path to import utils
-sys.path.append(str(Path(__file__).parent.parent))
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = "orjson"
+except ImportError:
+    pass
+from datetime import datetime
 from utils.styling import apply_custom_css, render_gradient_header
-from utils.analysis import generate_insights
+from utils.analysis import generate_insights, weekly_scores
 
 # ============================================================================== 
 # PAGE CONFIGURATION
@@ -29,26 +31,43 @@ apply_custom_css()
 # ============================================================================== 
 # CARD RENDER FUNCTION (DARK MODE FRIENDLY)
 # ==============================================================================
+INSIGHT_CARD_TEMPLATE = """
+<div style="
+    background-color: rgba(50, 50, 50, 0.85);
+    color: white;
+    padding: 1.5rem;
+    border-radius: 12px;
+    margin-bottom: 1rem;
+    box-shadow: 0 4px 8px rgba(0,0,0,0.3);
+    font-family: 'Arial', sans-serif;
+">
+    <div style="font-size: 1.2rem; font-weight: bold; margin-bottom: 0.5rem;">
+        💡 {title}
+    </div>
+    <div style="font-size: 1rem; color: #d1d5db;">
+        {description}
+    </div>
+</div>
+"""
+
 def render_insight_card_dark(insight):
     """Render insight card with dark background and visible font."""
-    return f"""
-    <div style="
-        background-color: rgba(50, 50, 50, 0.85);
-        color: white;
-        padding: 1.5rem;
-        border-radius: 12px;
-        margin-bottom: 1rem;
-        box-shadow: 0 4px 8px rgba(0,0,0,0.3);
-        font-family: 'Arial', sans-serif;
-    ">
-        <div style="font-size: 1.2rem; font-weight: bold; margin-bottom: 0.5rem;">
-            💡 {insight['title']}
-        </div>
-        <div style="font-size: 1rem; color: #d1d5db;">
-            {insight['description']}
-        </div>
-    </div>
-    """
+    return INSIGHT_CARD_TEMPLATE.format(title=insight['title'], description=insight['description'])
+
+# ============================================================================== 
+# CACHED COMPUTATIONS
+# ==============================================================================
+@st.cache_data(show_spinner=False)
+def _report_csv(merged_df, rhythm_score, machine_score, human_score):
+    """Merged data plus the overall scores, written straight to CSV bytes."""
+    buf = io.BytesIO()
+    merged_df.assign(
+        rhythm_score=rhythm_score,
+        machine_score=machine_score,
+        human_score=human_score
+    ).to_csv(buf, index=False, encoding='utf-8')
+    return buf.getvalue()
+
 
 # ============================================================================== 
 # MAIN INSIGHTS PAGE
@@ -74,11 +93,13 @@ def main():
     # Generate insights
     insights = generate_insights(results)
 
-    # Display insights in a visually appealing two-column grid
+    # Display insights in a visually appealing two-column grid, one markdown per column
     cols = st.columns(2)
-    for idx, insight in enumerate(insights):
-        with cols[idx % 2]:
-            st.markdown(render_insight_card_dark(insight), unsafe_allow_html=True)
+    for idx, col in enumerate(cols):
+        col.markdown(
+            "".join(render_insight_card_dark(insight) for insight in insights[idx::2]),
+            unsafe_allow_html=True
+        )
 
     st.markdown("<br><br>", unsafe_allow_html=True)
 
@@ -87,24 +108,9 @@ def main():
     merged_df = results['merged_data']
 
     # Weekly rhythm scores
-    merged_df['week'] = merged_df['date'].dt.isocalendar().week
-    weekly_scores = []
-
-    for week in merged_df['week'].unique():
-        week_data = merged_df[merged_df['week'] == week]
-        week_machine = (week_data['work_hours'].mean() / 8 * 50 + week_data['tasks_completed'].mean() / 10 * 50)
-        week_human = (week_data['mood_score'].mean() / 10 * 40 +
-                      (10 - week_data['stress_level'].mean()) / 10 * 30 +
-                      week_data['sleep_hours'].mean() / 8 * 30)
-        week_rhythm = (week_machine + week_human) / 2
-        weekly_scores.append({
-            'week': f"Week {int(week)}",
-            'score': round(week_rhythm, 1),
-            'machine': round(week_machine, 1),
-            'human': round(week_human, 1)
-        })
-
-    weekly_df = pd.DataFrame(weekly_scores)
+    if st.session_state.get('weekly_df') is None:
+        st.session_state.weekly_df = weekly_scores(merged_df)
+    weekly_df = st.session_state.weekly_df
 
     # Trend visualization
     fig = go.Figure()
@@ -138,13 +144,14 @@ def main():
         yaxis=dict(title="Rhythm Score", gridcolor='rgba(255,255,255,0.1)', range=[0, 100]),
         xaxis=dict(title="Time Period", gridcolor='rgba(255,255,255,0.1)'),
         height=400,
-        showlegend=False
+        showlegend=False,
+        uirevision='weekly'
     )
     st.plotly_chart(fig, use_container_width=True)
 
     # Trend analysis
-    if len(weekly_scores) >= 2:
-        trend = weekly_scores[-1]['score'] - weekly_scores[0]['score']
+    if len(weekly_df) >= 2:
+        trend = weekly_df['score'].iloc[-1] - weekly_df['score'].iloc[0]
         trend_emoji = "📈" if trend > 5 else "📉" if trend < -5 else "➡️"
         trend_text = "improving" if trend > 5 else "declining" if trend < -5 else "stable"
         trend_color = "#4ADE80" if trend > 5 else "#F87171" if trend < -5 else "#FBBF24"
@@ -154,7 +161,7 @@ def main():
                         border-radius: 15px; margin-top: 2rem;'>
                 <div style='font-size: 3rem; margin-bottom: 1rem;'>{trend_emoji}</div>
                 <p style='font-size: 1.3rem; color: {trend_color}; font-weight: bold;'>{trend_text}</p>
-                <p style='color: #ffffff;'>{abs(trend):.1f} point {'increase' if trend > 0 else 'decrease'} from week 1 to week {len(weekly_scores)}</p>
+                <p style='color: #ffffff;'>{abs(trend):.1f} point {'increase' if trend > 0 else 'decrease'} from week 1 to week {len(weekly_df)}</p>
             </div>
         """, unsafe_allow_html=True)
 
@@ -187,6 +194,7 @@ def main():
         xaxis=dict(title="Week", gridcolor='rgba(255,255,255,0.1)'),
         height=350,
         hovermode='x unified',
+        uirevision='weekly',
         legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
     )
     st.plotly_chart(fig, use_container_width=True)
@@ -194,10 +202,12 @@ def main():
     # Action buttons & download
     col1, col2, col3 = st.columns(3)
     with col1:
-        csv = merged_df.to_csv(index=False)
         st.download_button(
             "📥 Download Full Report",
-            data=csv,
+            data=_report_csv(
+                merged_df,
+                results['rhythm_score'], results['machine_score'], results['human_score']
+            ),
             file_name=f"rhythm_report_{datetime.now().strftime('%Y%m%d')}.csv",
             mime="text/csv",
             use_container_width=True
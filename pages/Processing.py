@@ -9,7 +9,11 @@ AI Processing Page
 import streamlit as st
 import time
 from utils.styling import apply_custom_css
-from utils.analysis import calculate_rhythm_score
+from utils.analysis import (calculate_rhythm_score, detect_anomalies, generate_insights,
+                            weekly_scores, work_intensity_pivot)
+
+# Shortest time each step stays on screen; ?fast=1 skips the animation entirely
+MIN_STEP_SECONDS = 0.3
 
 st.set_page_config(page_title="Processing", page_icon="🧠", layout="wide")
 apply_custom_css()
@@ -54,28 +58,53 @@ with col2:
         ("Calculating Rhythm Score and anomalies", 80),
         ("Generating personalized insights", 100)
     ]
+    fast = st.query_params.get("fast") == "1"
     
-    for step_text, progress in steps:
+    def run_step(index, stage, *args):
+        """Show a processing step while its stage of the analysis runs"""
+        step_text, progress = steps[index]
         status_text.markdown(f"""
             <div style='text-align: center; color: #B794F6; font-size: 1.1rem; margin: 1rem 0;'>
                 {step_text}...
             </div>
         """, unsafe_allow_html=True)
         progress_bar.progress(progress)
-        time.sleep(0.8)
+        
+        started = time.perf_counter()
+        result = stage(*args)
+        if not fast:
+            time.sleep(max(0.0, MIN_STEP_SECONDS - (time.perf_counter() - started)))
+        return result
+    
+    # Each step does real work; anomalies and insights are cached, so this
+    # warms them for the Dashboard and Insights pages
+    analysis_results = run_step(0, calculate_rhythm_score,
+                                st.session_state.work_data, st.session_state.mood_data)
+    if analysis_results is None:
+        progress_bar.empty()
+        status_text.empty()
+        st.error("❌ Work and mood CSVs have no overlapping dates.")
+        if st.button("← Back to Upload"):
+            st.switch_page("pages/Upload_Data.py")
+        st.stop()
+    merged_df = analysis_results['merged_data']
+    weekly_df = run_step(1, weekly_scores, merged_df)
+    work_pivot = run_step(2, work_intensity_pivot, merged_df)
+    run_step(3, detect_anomalies, merged_df)
+    run_step(4, generate_insights, analysis_results)
     
-    # Perform actual analysis
-    if not st.session_state.analysis_complete:
-        with st.spinner('Finalizing analysis...'):
-            analysis_results = calculate_rhythm_score(
-                st.session_state.work_data,
-                st.session_state.mood_data
-            )
-            st.session_state.rhythm_score = analysis_results
-            st.session_state.analysis_complete = True
+    st.session_state.date_meta = {
+        'date_min': merged_df['date'].min(),
+        'date_max': merged_df['date'].max()
+    }
+    st.session_state.weekly_df = weekly_df
+    st.session_state.work_pivot = work_pivot
+    st.session_state.rhythm_score = analysis_results
+    st.session_state.analysis_complete = True
     
     st.success("✅ Analysis Complete!")
-    time.sleep(1)
+    if not fast:
+        time.sleep(MIN_STEP_SECONDS)
     
     # Navigate to dashboard
     st.switch_page("pages/Dashboard.py")
@@ -18,6 +18,14 @@ for key in ["work_data", "mood_data", "analysis_complete"]:
     if key not in st.session_state:
         st.session_state[key] = None
 
+def read_upload(file):
+    """Parse an uploaded CSV; raises if the date column did not parse as dates"""
+    df = pd.read_csv(file, engine='pyarrow', parse_dates=['date'])
+    # pyarrow leaves the column as text when any value fails to parse
+    if not pd.api.types.is_datetime64_any_dtype(df['date']):
+        raise ValueError("'date' column has values that are not valid dates (expected YYYY-MM-DD)")
+    return df
+
 # =========================
 # Page config & custom CSS
 # =========================
@@ -80,8 +88,7 @@ date,work_hours,tasks_completed,server_uptime
     
     if work_file:
         try:
-            work_df = pd.read_csv(work_file)
-            work_df['date'] = pd.to_datetime(work_df['date'])
+            work_df = read_upload(work_file)
             
             is_valid, message = validate_csv_format(work_df, 'work')
             if is_valid:
@@ -123,8 +130,7 @@ date,mood_score,stress_level,sleep_hours
     
     if mood_file:
         try:
-            mood_df = pd.read_csv(mood_file)
-            mood_df['date'] = pd.to_datetime(mood_df['date'])
+            mood_df = read_upload(mood_file)
             
             is_valid, message = validate_csv_format(mood_df, 'mood')
             if is_valid:
@@ -7,9 +7,33 @@
 AI analysis functions for rhythm score calculation and insights generation
 """
 
+import streamlit as st
 import pandas as pd
 import numpy as np
 
+def _hash_frame(df):
+    """Content hash of a DataFrame: row values and index, plus column names and dtypes"""
+    # hash_pandas_object only sees values, so the schema is appended explicitly
+    schema = repr((tuple(df.columns), tuple(df.dtypes.astype(str))))
+    return pd.util.hash_pandas_object(df, index=True).values.tobytes() + schema.encode()
+
+# Hash DataFrame arguments by content with pandas' vectorized row hashing,
+# which is much cheaper than Streamlit's generic DataFrame hasher
+_DF_HASH_FUNCS = {pd.DataFrame: _hash_frame}
+
+# Task counts are narrowed to int16 only when that is lossless. The float score
+# columns stay float64: the insight medians and threshold counts change under
+# float32 rounding, and the cards show them to one decimal or a whole percent
+_INT16_MIN, _INT16_MAX = np.iinfo(np.int16).min, np.iinfo(np.int16).max
+
+def _compact_tasks(tasks):
+    """Task counts as int16 when all present, whole and in range; otherwise unchanged"""
+    values = tasks.to_numpy(dtype=np.float64, na_value=np.nan)
+    if (values.size and np.isfinite(values).all() and (values == np.round(values)).all()
+            and values.min() >= _INT16_MIN and values.max() <= _INT16_MAX):
+        return tasks.astype(np.int16)
+    return tasks
+
 def validate_csv_format(df, data_type):
     """Validate CSV format based on data type (work or mood)"""
     required_columns = {
@@ -26,27 +50,56 @@ def validate_csv_format(df, data_type):
     
     return True, "Valid format"
 
+# Columns of the correlation matrix returned by calculate_rhythm_score
+CORR_COLUMNS = ['work_hours', 'mood_score', 'sleep_hours', 'stress_level']
+_CORR_INDEX = {col: i for i, col in enumerate(CORR_COLUMNS)}
+
+# Score inputs, in the column order of _rhythm_kernel and _weekly_kernel
+WEEKLY_COLUMNS = ['work_hours', 'tasks_completed', 'mood_score', 'stress_level', 'sleep_hours']
+
+def _rhythm_kernel(columns):
+    """Score arithmetic on a float64 (rows, WEEKLY_COLUMNS) block: means, component scores, penalty"""
+    # One reduction for all five column means; NaNs are skipped like Series.mean()
+    avg_work_hours, avg_tasks, avg_mood, avg_stress, avg_sleep = np.nanmean(columns, axis=0)
+    
+    machine_score = min(100, (avg_work_hours / 8 * 50 + avg_tasks / 10 * 50))
+    human_score = (avg_mood / 10 * 40 + (10 - avg_stress) / 10 * 30 + avg_sleep / 8 * 30)
+    
+    imbalance = abs(machine_score - human_score)
+    balance_penalty = (imbalance / 100) * 20
+    rhythm_score = (machine_score + human_score) / 2 - balance_penalty
+    
+    return (rhythm_score, machine_score, human_score,
+            avg_work_hours, avg_mood, avg_stress, avg_sleep)
+
+@st.cache_data(show_spinner=False, max_entries=8, hash_funcs=_DF_HASH_FUNCS)
 def calculate_rhythm_score(work_df, mood_df):
     """
     AI-powered calculation of Rhythm Score
     Placeholder for actual ML model implementation
+    Returns None when the two datasets share no dates
     """
     # Merge datasets on date
     merged_df = pd.merge(work_df, mood_df, on='date', how='inner')
+    if merged_df.empty:
+        # No overlapping dates: nothing to score, let the caller report it
+        return None
     
-    # Calculate component scores (0-100 scale)
-    avg_work_hours = merged_df['work_hours'].mean()
-    avg_tasks = merged_df['tasks_completed'].mean()
-    machine_score = min(100, (avg_work_hours / 8 * 50 + avg_tasks / 10 * 50))
+    merged_df['tasks_completed'] = _compact_tasks(merged_df['tasks_completed'])
     
-    avg_mood = merged_df['mood_score'].mean()
-    avg_stress = merged_df['stress_level'].mean()
-    avg_sleep = merged_df['sleep_hours'].mean()
-    human_score = (avg_mood / 10 * 40 + (10 - avg_stress) / 10 * 30 + avg_sleep / 8 * 30)
+    # Calendar columns used by the heatmap and weekly views, derived once here
+    merged_df['day_of_week'] = merged_df['date'].dt.day_name()
+    # Nullable UInt32 week: rows with a missing date keep <NA> instead of raising
+    merged_df['week'] = merged_df['date'].dt.isocalendar().week
     
-    imbalance = abs(machine_score - human_score)
-    balance_penalty = (imbalance / 100) * 20
-    rhythm_score = (machine_score + human_score) / 2 - balance_penalty
+    # Calculate component scores (0-100 scale) on the raw column arrays
+    (rhythm_score, machine_score, human_score,
+     avg_work_hours, avg_mood, avg_stress, avg_sleep) = _rhythm_kernel(
+        merged_df[WEEKLY_COLUMNS].to_numpy(dtype=np.float64)
+    )
+    
+    # All pairwise correlations in one pass; NaNs are dropped per pair like Series.corr()
+    corr_matrix = merged_df[CORR_COLUMNS].corr().to_numpy()
     
     return {
         'rhythm_score': round(rhythm_score, 1),
@@ -56,10 +109,12 @@ def calculate_rhythm_score(work_df, mood_df):
         'avg_mood': round(avg_mood, 1),
         'avg_stress': round(avg_stress, 1),
         'avg_sleep': round(avg_sleep, 1),
-        'correlation': round(merged_df['work_hours'].corr(merged_df['mood_score']), 2),
+        'correlation': round(corr_matrix[_CORR_INDEX['work_hours'], _CORR_INDEX['mood_score']], 2),
+        'corr_matrix': corr_matrix,
         'merged_data': merged_df
     }
 
+@st.cache_data(show_spinner=False, max_entries=8, hash_funcs=_DF_HASH_FUNCS)
 def detect_anomalies(merged_df):
     """AI-powered anomaly detection"""
     anomalies = []
@@ -86,8 +141,9 @@ def detect_anomalies(merged_df):
     
     # Positive trends
     if len(merged_df) > 7:
-        recent_mood = merged_df.tail(7)['mood_score'].mean()
-        earlier_mood = merged_df.head(7)['mood_score'].mean()
+        mood = merged_df['mood_score'].to_numpy()
+        recent_mood = float(np.nanmean(mood[-7:]))
+        earlier_mood = float(np.nanmean(mood[:7]))
         if recent_mood > earlier_mood + 1:
             anomalies.append({
                 'type': 'success',
@@ -96,15 +152,11 @@ def detect_anomalies(merged_df):
                 'icon': '✨'
             })
     
-    # Overwork periods
-    consecutive_overwork = 0
-    max_consecutive = 0
-    for hours in merged_df['work_hours']:
-        if hours > 9:
-            consecutive_overwork += 1
-            max_consecutive = max(max_consecutive, consecutive_overwork)
-        else:
-            consecutive_overwork = 0
+    # Overwork periods: longest run of 9+ hour days, from the run boundaries
+    overwork = (merged_df['work_hours'].to_numpy() > 9).astype(np.int8)
+    edges = np.diff(np.concatenate(([0], overwork, [0])))
+    runs = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+    max_consecutive = int(runs.max()) if runs.size else 0
     
     if max_consecutive >= 3:
         anomalies.append({
@@ -116,18 +168,23 @@ def detect_anomalies(merged_df):
     
     return anomalies
 
+# Inner edges of the Low / Optimal / High work-hour buckets
+HOUR_BIN_EDGES = np.array([7, 9])
+HOUR_LABELS = ['Low', 'Optimal', 'High']
+
+@st.cache_data(show_spinner=False, max_entries=8, hash_funcs=_DF_HASH_FUNCS)
 def generate_insights(analysis_results):
     """AI-generated personalized insights"""
     insights = []
     merged_df = analysis_results['merged_data']
     correlation = analysis_results['correlation']
     
-    # Peak productivity pattern
-    merged_df['hour_category'] = pd.cut(merged_df['work_hours'], 
-                                         bins=[0, 7, 9, 24], 
-                                         labels=['Low', 'Optimal', 'High'])
-    mood_by_hours = merged_df.groupby('hour_category')['mood_score'].mean()
-    best_category = mood_by_hours.idxmax()
+    # Peak productivity pattern: bucket days into (0, 7], (7, 9], (9, 24] hours
+    work_hours = merged_df['work_hours'].to_numpy()
+    hour_bin = np.searchsorted(HOUR_BIN_EDGES, work_hours, side='left')
+    in_range = (work_hours > 0) & (work_hours <= 24)
+    mood_by_hours = pd.Series(merged_df['mood_score'].to_numpy()[in_range]).groupby(hour_bin[in_range]).mean()
+    best_category = HOUR_LABELS[mood_by_hours.idxmax()]
     
     insights.append({
         'icon': '📈',
@@ -156,7 +213,7 @@ def generate_insights(analysis_results):
         })
     
     # Sleep impact
-    sleep_mood_corr = merged_df['sleep_hours'].corr(merged_df['mood_score'])
+    sleep_mood_corr = analysis_results['corr_matrix'][_CORR_INDEX['sleep_hours'], _CORR_INDEX['mood_score']]
     if sleep_mood_corr > 0.4:
         insights.append({
             'icon': '😴',
@@ -166,34 +223,109 @@ def generate_insights(analysis_results):
             'color': 'human'
         })
     
-    # Optimal work range
-    optimal_work = merged_df[merged_df['mood_score'] >= 7]['work_hours'].median()
+    # Optimal work range, masked on the raw arrays instead of filtered frames
+    mood = merged_df['mood_score'].to_numpy()
+    high_mood_hours = work_hours[(mood >= 7) & ~np.isnan(work_hours)]
+    optimal_work = float(np.median(high_mood_hours)) if high_mood_hours.size else np.nan
+    adherence = np.count_nonzero(np.abs(work_hours - optimal_work) < 1) / work_hours.size * 100
     insights.append({
         'icon': '🎯',
         'title': 'Your Sweet Spot Identified',
         'description': f'You maintain high mood (7+) with around {optimal_work:.1f} work hours per day',
-        'recommendation': f'Target {optimal_work:.1f} hours as your baseline. Current adherence: {len(merged_df[abs(merged_df["work_hours"] - optimal_work) < 1]) / len(merged_df) * 100:.0f}%',
+        'recommendation': f'Target {optimal_work:.1f} hours as your baseline. Current adherence: {adherence:.0f}%',
         'color': 'balance'
     })
     
     return insights
 
-def generate_sample_data():
-    """Generate sample data for testing"""
-    dates = pd.date_range(start='2025-01-01', periods=30, freq='D')
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+def _weekly_kernel(wh, tc, ms, sl, sh):
+    """Machine and human scores from per-week column means as plain float arrays"""
+    machine = wh / 8 * 50 + tc / 10 * 50
+    human = ms / 10 * 40 + (10 - sl) / 10 * 30 + sh / 8 * 30
+    return machine, human
+
+def weekly_scores(merged_df):
+    """Machine, human and rhythm scores aggregated per ISO week"""
+    # One grouped mean over all five columns; weeks stay in date order
+    g = merged_df.groupby('week', sort=False)[WEEKLY_COLUMNS].mean()
+    
+    machine, human = _weekly_kernel(*g.to_numpy(dtype=np.float64).T)
+    score = (machine + human) / 2
+    
+    return pd.DataFrame({
+        'week': 'Week ' + g.index.astype(str),
+        'score': score.round(1),
+        'machine': machine.round(1),
+        'human': human.round(1)
+    })
+
+def work_intensity_pivot(merged_df):
+    """Mean work hours per weekday (rows) and ISO week (columns)"""
+    day_codes = pd.Categorical(merged_df['day_of_week'], categories=DAY_ORDER).codes.astype(np.int64)
+    week_codes, weeks = pd.factorize(merged_df['week'], sort=True)
+    
+    # Sum and count every (day, week) cell in one bincount pass each; rows with a
+    # missing date (code -1) are skipped, as pivot_table drops NaN keys
+    work_hours = merged_df['work_hours'].to_numpy(dtype=np.float64)
+    valid = ~np.isnan(work_hours) & (day_codes >= 0) & (week_codes >= 0)
+    cells = (day_codes * len(weeks) + week_codes)[valid]
+    size = len(DAY_ORDER) * len(weeks)
+    sums = np.bincount(cells, weights=work_hours[valid], minlength=size).reshape(len(DAY_ORDER), -1)
+    counts = np.bincount(cells, minlength=size).reshape(len(DAY_ORDER), -1)
+    
+    with np.errstate(invalid='ignore'):
+        means = np.where(counts > 0, sums / counts, np.nan)
+    
+    # Match pivot_table: drop weekdays and weeks without any data
+    rows, cols = counts.any(axis=1), counts.any(axis=0)
+    return pd.DataFrame(
+        means[rows][:, cols],
+        index=pd.Index(np.array(DAY_ORDER)[rows], name='day_of_week'),
+        columns=pd.Index(weeks[cols], name='week')
+    )
+
+@st.cache_data(show_spinner=False)
+def generate_sample_data(seed=42, n=30):
+    """Generate reproducible sample data for testing; built once per (seed, n), copied per caller"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start='2025-01-01', periods=n, freq='D')
     
     work_data = pd.DataFrame({
         'date': dates,
-        'work_hours': np.random.normal(8, 1.5, 30).clip(5, 12),
-        'tasks_completed': np.random.poisson(10, 30),
-        'server_uptime': np.random.uniform(98, 100, 30)
+        'work_hours': rng.normal(8, 1.5, n).clip(5, 12),
+        'tasks_completed': rng.poisson(10, n),
+        'server_uptime': rng.uniform(98, 100, n)
     })
     
     mood_data = pd.DataFrame({
         'date': dates,
-        'mood_score': (10 - work_data['work_hours'] * 0.5 + np.random.normal(0, 1, 30)).clip(1, 10),
-        'stress_level': (work_data['work_hours'] * 0.5 + np.random.normal(0, 1, 30)).clip(1, 10),
-        'sleep_hours': (9 - work_data['work_hours'] * 0.2 + np.random.normal(0, 0.5, 30)).clip(5, 9)
+        'mood_score': (10 - work_data['work_hours'] * 0.5 + rng.normal(0, 1, n)).clip(1, 10),
+        'stress_level': (work_data['work_hours'] * 0.5 + rng.normal(0, 1, n)).clip(1, 10),
+        'sleep_hours': (9 - work_data['work_hours'] * 0.2 + rng.normal(0, 0.5, n)).clip(5, 9)
     })
     
-    return work_data, mood_data
\ No newline at end of file
+    return work_data, mood_data
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: row indices that best preserve the shape of y(x)"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        idx[i + 1] = a
+    
+    return idx
@@ -2,81 +2,43 @@
 styling.py - CSS styling and UI components for Rhythm of the Machines
 """
 
+import bisect
+import functools
+import numbers
+import re
 import streamlit as st
+from pathlib import Path
+from types import MappingProxyType
+from typing import Final
+
+# Palette shared with the :root variables in static/styles.css
+_COLOR_MACHINE: Final = "#00D9FF"
+_COLOR_HUMAN: Final = "#FF6B9D"
+_COLOR_BALANCE: Final = "#B794F6"
+_COLOR_SUCCESS: Final = "#4ADE80"
+_COLOR_WARNING: Final = "#FBBF24"
+_COLOR_DANGER: Final = "#F87171"
+
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_CSS_WHITESPACE = re.compile(r"\s+")
+_CSS_PUNCT_SPACE = re.compile(r"\s*([{};])\s*")
+
+def _minify_css(css):
+    """Strip comments and collapse whitespace in a stylesheet"""
+    css = _CSS_COMMENT.sub("", css)
+    css = _CSS_WHITESPACE.sub(" ", css)
+    return _CSS_PUNCT_SPACE.sub(r"\1", css).strip()
+
+# The stylesheet lives in the app's static folder but is inlined, minified once at
+# import: linking it from app/static/ relies on the server sending text/css, which
+# Streamlit releases inside the requirements range do not all do
+_CSS_PATH = Path(__file__).resolve().parent.parent / 'static' / 'styles.css'
+_CSS_HTML = f"<style>{_minify_css(_CSS_PATH.read_text(encoding='utf-8'))}</style>"
 
 def apply_custom_css():
     """Apply custom CSS styling to the Streamlit app"""
-    st.markdown("""
-    <style>
-        /* Main color palette */
-        :root {
-            --machine-color: #00D9FF;
-            --human-color: #FF6B9D;
-            --balance-color: #B794F6;
-        }
-        
-        /* Hide default Streamlit elements */
-        #MainMenu {visibility: hidden;}
-        footer {visibility: hidden;}
-        
-        /* Custom button styling */
-        .stButton>button {
-            width: 100%;
-            background: linear-gradient(135deg, #00D9FF 0%, #FF6B9D 100%);
-            color: white;
-            border: none;
-            padding: 1rem 2rem;
-            font-size: 1.2rem;
-            font-weight: bold;
-            border-radius: 15px;
-            transition: all 0.3s;
-        }
-        
-        .stButton>button:hover {
-            transform: scale(1.05);
-            box-shadow: 0 10px 30px rgba(0, 217, 255, 0.3);
-        }
-        
-        /* Metric cards */
-        [data-testid="stMetricValue"] {
-            font-size: 2.5rem;
-            font-weight: bold;
-        }
-        
-        /* File uploader styling */
-        [data-testid="stFileUploader"] {
-            border: 2px dashed #00D9FF;
-            border-radius: 15px;
-            padding: 2rem;
-            background-color: rgba(0, 217, 255, 0.05);
-        }
-        
-        /* Alert boxes */
-        .alert-success {
-            background-color: rgba(74, 222, 128, 0.1);
-            border-left: 4px solid #4ADE80;
-            padding: 1rem;
-            border-radius: 10px;
-            margin: 1rem 0;
-        }
-        
-        .alert-warning {
-            background-color: rgba(251, 191, 36, 0.1);
-            border-left: 4px solid #FBBF24;
-            padding: 1rem;
-            border-radius: 10px;
-            margin: 1rem 0;
-        }
-        
-        .alert-danger {
-            background-color: rgba(248, 113, 113, 0.1);
-            border-left: 4px solid #F87171;
-            padding: 1rem;
-            border-radius: 10px;
-            margin: 1rem 0;
-        }
-    </style>
-    """, unsafe_allow_html=True)
+    # Streamlit clears elements a rerun does not redraw, so emit the tag every run
+    st.markdown(_CSS_HTML, unsafe_allow_html=True)
 
 def render_gradient_header(title, subtitle=None):
     """Render a gradient header (subtitle removed for Insights page)"""
@@ -88,88 +50,104 @@ def render_gradient_header(title, subtitle=None):
     """
     st.markdown(html, unsafe_allow_html=True)
 
-def render_feature_card(icon, title, description, color="balance"):
-    """Render a feature highlight card"""
-    color_map = {
-        "machine": "#00D9FF",
-        "human": "#FF6B9D",
-        "balance": "#B794F6"
-    }
-    
-    card_color = color_map.get(color, color_map["balance"])
-    
-    return f"""
-        <div style='text-align: center; padding: 1.5rem; background: rgba({
-            '0, 217, 255' if color == 'machine' else 
-            '255, 107, 157' if color == 'human' else 
-            '183, 148, 246'
-        }, 0.1); 
-                    border-radius: 15px; margin: 1rem 0;'>{icon}</div>
-            <div style='font-weight: bold; color: {card_color}; margin-top: 0.5rem;'>{title}</div>
-            <div style='color: #94a3b8; font-size: 0.9rem;'>{description}</div>
+# Card variants styled by the .card-* classes in the stylesheet; the templates
+# are read-only views built once, and unknown variants fall back to balance
+_CARD_VARIANTS: Final = ("machine", "human", "balance")
+
+# Card templates with the variant class baked in at import; only the text
+# fields are filled per call, with plain %s substitution
+_FEATURE_CARD_TEMPLATE = """
+        <div class='feature-card card-{variant}'>
+            <div>%s</div>
+            <div class='feature-card-title'>%s</div>
+            <div class='feature-card-description'>%s</div>
         </div>
     """
+_FEATURE_CARD_TEMPLATES = MappingProxyType({
+    variant: _FEATURE_CARD_TEMPLATE.format(variant=variant) for variant in _CARD_VARIANTS
+})
+_DEFAULT_FEATURE_CARD = _FEATURE_CARD_TEMPLATES["balance"]
 
-def render_alert_box(alert_type, title, description, icon=""):
-    """Render an alert box with specified type"""
-    alert_class = f"alert-{alert_type}"
-    
-    return f"""
-        <div class='{alert_class}'>
-            <strong>{icon} {title}</strong><br>
-            <small>{description}</small>
+_INSIGHT_CARD_TEMPLATE = """
+        <div class='insight-card card-{variant}'>
+            <div class='insight-card-icon'>%(icon)s</div>
+            <h3>%(title)s</h3>
+            <p>%(description)s</p>
+            <div class='insight-card-recommendation'>
+                <strong>💡 Recommendation:</strong><br>
+                <span>%(recommendation)s</span>
+            </div>
         </div>
     """
+# The insight card is the largest template, so each variant gets a renderer with
+# its constant segments around the four fields pre-split, joined in one str.join
+_TEMPLATE_FIELD = re.compile(r"%\(\w+\)s")
 
-def render_insight_card(insight):
-    """Render an insight card with recommendations"""
-    bg_colors = {
-        'machine': 'rgba(0, 217, 255, 0.05)',
-        'human': 'rgba(255, 107, 157, 0.05)',
-        'balance': 'rgba(183, 148, 246, 0.05)'
-    }
-    border_colors = {
-        'machine': '#00D9FF',
-        'human': '#FF6B9D',
-        'balance': '#B794F6'
-    }
+def _make_insight_renderer(variant):
+    """Build an insight card renderer with the variant's template segments baked in"""
+    p0, p1, p2, p3, p4 = _TEMPLATE_FIELD.split(_INSIGHT_CARD_TEMPLATE.format(variant=variant))
     
-    bg_color = bg_colors.get(insight['color'], bg_colors['balance'])
-    border_color = border_colors.get(insight['color'], border_colors['balance'])
+    def render(icon, title, description, recommendation):
+        return "".join((p0, icon, p1, title, p2, description, p3, recommendation, p4))
     
-    return f"""
-        <div style='padding: 2rem; background: {bg_color}; 
-                    border-left: 4px solid {border_color}; border-radius: 15px; 
-                    margin-bottom: 1.5rem; min-height: 250px;'>
-            <div style='font-size: 2.5rem; margin-bottom: 1rem;'>{insight['icon']}</div>
-            <h3 style='color: white; margin-bottom: 1rem;'>{insight['title']}</h3>
-            <p style='color: #94a3b8; margin-bottom: 1rem;'>{insight['description']}</p>
-            <div style='background: rgba(0,0,0,0.3); padding: 1rem; border-radius: 10px;'>
-                <strong style='color: {border_color};'>💡 Recommendation:</strong><br>
-                <span style='color: #cbd5e1; font-size: 0.95rem;'>{insight['recommendation']}</span>
-            </div>
+    return render
+
+_INSIGHT_RENDERERS = MappingProxyType({
+    variant: _make_insight_renderer(variant) for variant in _CARD_VARIANTS
+})
+_DEFAULT_INSIGHT_RENDERER = _INSIGHT_RENDERERS["balance"]
+
+_ALERT_BOX_TEMPLATE = """
+        <div class='alert-%s'>
+            <strong>%s %s</strong><br>
+            <small>%s</small>
+        </div>
+    """
+
+_METRIC_CARD_TEMPLATE = """
+        <div class='metric-card'>
+            <div class='metric-card-label'>%s</div>
+            <div class='metric-card-value'>%s</div>
+            %s
         </div>
     """
+_METRIC_DELTA_TEMPLATE = "<div class='metric-card-delta metric-delta-%s'>%s</div>"
+
+# The card renderers are pure functions of hashable arguments, so reruns that
+# redraw the same cards are served from these caches
+@functools.lru_cache(maxsize=256)
+def render_feature_card(icon, title, description, color="balance"):
+    """Render a feature highlight card"""
+    template = _FEATURE_CARD_TEMPLATES.get(color, _DEFAULT_FEATURE_CARD)
+    return template % (icon, title, description)
+
+@functools.lru_cache(maxsize=256)
+def render_alert_box(alert_type, title, description, icon=""):
+    """Render an alert box with specified type"""
+    return _ALERT_BOX_TEMPLATE % (alert_type, icon, title, description)
 
+@functools.lru_cache(maxsize=256)
+def render_insight_card(icon, title, description, recommendation, color="balance"):
+    """Render an insight card with recommendations; unpack an insight dict with **insight"""
+    render = _INSIGHT_RENDERERS.get(color, _DEFAULT_INSIGHT_RENDERER)
+    return render(icon, title, description, recommendation)
+
+@functools.lru_cache(maxsize=256)
 def render_metric_card(label, value, delta=None):
     """Render a custom metric card"""
     delta_html = ""
     if delta:
-        delta_color = "#4ADE80" if "+" in str(delta) else "#F87171"
-        delta_html = f"<div style='color: {delta_color}; font-size: 0.9rem;'>{delta}</div>"
+        # Numeric deltas go by sign, text deltas by a leading "+"
+        if isinstance(delta, numbers.Real):
+            direction = "up" if delta > 0 else "down"
+        else:
+            direction = "up" if str(delta).startswith("+") else "down"
+        delta_html = _METRIC_DELTA_TEMPLATE % (direction, delta)
     
-    return f"""
-        <div style='padding: 1.5rem; background: rgba(183, 148, 246, 0.1); 
-                    border-radius: 15px; text-align: center;'>
-            <div style='color: #94a3b8; font-size: 0.9rem; margin-bottom: 0.5rem;'>{label}</div>
-            <div style='font-size: 2rem; font-weight: bold; color: white;'>{value}</div>
-            {delta_html}
-        </div>
-    """
+    return _METRIC_CARD_TEMPLATE % (label, value, delta_html)
 
-def render_sidebar():
-    """Render the sidebar navigation"""
-    st.markdown("""
+# Sidebar header, divider and footer as one block, so they render as one element
+_SIDEBAR_HTML = """
         <div style='text-align: center; padding: 2rem 0;'>
             <h2 style='background: linear-gradient(135deg, #00D9FF 0%, #FF6B9D 100%); 
                        -webkit-background-clip: text; -webkit-text-fill-color: transparent;'>
@@ -177,51 +155,56 @@ def render_sidebar():
             </h2>
             <p style='color: #94a3b8; font-size: 0.9rem;'>Rhythm of the Machines</p>
         </div>
-    """, unsafe_allow_html=True)
-    
-    st.markdown("---")
-    
-    st.markdown("""
+        <hr>
         <div style='text-align: center; color: #64748b; font-size: 0.75rem; padding: 1rem;'>
             <p>Built for Hackathon 2025</p>
             <p>Balance • Harmony • Rhythm</p>
         </div>
-    """, unsafe_allow_html=True)
+    """
 
-def render_score_gauge_layout(rhythm_score, machine_score, human_score):
-    """Render the layout for the central rhythm score gauge"""
-    # Determine status and color
-    if rhythm_score >= 75:
-        status = "Excellent"
-        color = "#4ADE80"
-    elif rhythm_score >= 60:
-        status = "Balanced"
-        color = "#B794F6"
-    elif rhythm_score >= 45:
-        status = "Moderate"
-        color = "#FBBF24"
-    else:
-        status = "Needs Attention"
-        color = "#F87171"
-    
-    return {
-        'status': status,
-        'color': color,
-        'html_wrapper_start': """
-            <div style='text-align: center; padding: 3rem; background: linear-gradient(135deg, rgba(0, 217, 255, 0.1) 0%, rgba(255, 107, 157, 0.1) 100%); 
+def render_sidebar():
+    """Render the sidebar navigation"""
+    # Emitted every run: Streamlit clears elements a rerun does not redraw
+    st.markdown(_SIDEBAR_HTML, unsafe_allow_html=True)
+
+# Gauge status buckets: scores below 45, 45-60, 60-75 and 75+
+_GAUGE_THRESHOLDS: Final = (45, 60, 75)
+_GAUGE_STATUS: Final = (
+    ("Needs Attention", _COLOR_DANGER),
+    ("Moderate", _COLOR_WARNING),
+    ("Balanced", _COLOR_BALANCE),
+    ("Excellent", _COLOR_SUCCESS)
+)
+
+_GAUGE_WRAPPER_START = """
+            <div style='text-align: center; padding: 3rem; background: linear-gradient(135deg, var(--machine-bg) 0%, var(--human-bg) 100%); 
                         border-radius: 30px; margin-bottom: 2rem; box-shadow: 0 10px 40px rgba(183, 148, 246, 0.2);'>
-        """,
-        'html_wrapper_end': "</div>",
-        'component_scores_html': f"""
+        """
+_GAUGE_WRAPPER_END = "</div>"
+
+_COMPONENT_SCORES_TEMPLATE: Final = f"""
             <div style='display: flex; justify-content: center; gap: 3rem; margin-top: 2rem;'>
                 <div style='text-align: center;'>
-                    <div style='color: #00D9FF; font-size: 2rem; font-weight: bold;'>🤖 {machine_score}</div>
+                    <div style='color: {_COLOR_MACHINE}; font-size: 2rem; font-weight: bold;'>🤖 %s</div>
                     <div style='color: #94a3b8;'>Machine Score</div>
                 </div>
                 <div style='text-align: center;'>
-                    <div style='color: #FF6B9D; font-size: 2rem; font-weight: bold;'>❤️ {human_score}</div>
+                    <div style='color: {_COLOR_HUMAN}; font-size: 2rem; font-weight: bold;'>❤️ %s</div>
                     <div style='color: #94a3b8;'>Human Score</div>
                 </div>
             </div>
         """
+_COMPONENT_SCORES_SEGMENTS: Final = tuple(_COMPONENT_SCORES_TEMPLATE.split("%s"))
+
+def render_score_gauge_layout(rhythm_score, machine_score, human_score):
+    """Render the layout for the central rhythm score gauge"""
+    status, color = _GAUGE_STATUS[bisect.bisect_right(_GAUGE_THRESHOLDS, rhythm_score)]
+    head, mid, tail = _COMPONENT_SCORES_SEGMENTS
+    
+    return {
+        'status': status,
+        'color': color,
+        'html_wrapper_start': _GAUGE_WRAPPER_START,
+        'html_wrapper_end': _GAUGE_WRAPPER_END,
+        'component_scores_html': "".join((head, str(machine_score), mid, str(human_score), tail))
     }